@@ -0,0 +1,80 @@
+"""Benchmark the cold-start cost of importing main and m_ast.
+
+Each run imports the module in a fresh interpreter with ``-X importtime``
+and reports the median cumulative import time, the slowest modules it pulled
+in and whether any of the heavy runtime dependencies (pandas, duckdb,
+pyarrow, jinja2) were loaded. Bytecode is cached in a temporary directory
+and warmed first, so the numbers reflect an installed package. Run with:
+
+    python benchmarks/bench_import.py --module main --repeat 20
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+HEAVY = ("pandas", "duckdb", "pyarrow", "jinja2", "numpy")
+
+
+def import_once(module: str, pycache: str) -> dict:
+    """Import *module* in a new interpreter; return {module: cumulative us}."""
+    env = dict(os.environ, PYTHONPATH=SRC)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-X",
+            f"pycache_prefix={pycache}",
+            "-c",
+            f"import {module}",
+        ],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            times[name.strip()] = int(cumulative)
+        except ValueError:
+            continue  # the header line
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pycache:
+        import_once(args.module, pycache)
+        runs = [import_once(args.module, pycache) for _ in range(args.repeat)]
+
+    totals = [run[args.module] for run in runs]
+    print(
+        f"import {args.module}: median {statistics.median(totals) / 1000:.1f} ms, "
+        f"min {min(totals) / 1000:.1f} ms over {args.repeat} runs"
+    )
+    last = runs[-1]
+    heavy = [name for name in HEAVY if name in last]
+    print(f"heavy dependencies loaded: {', '.join(heavy) or 'none'}")
+    print("slowest modules (cumulative, last run):")
+    ranked = sorted(last.items(), key=lambda item: item[1], reverse=True)
+    for name, micros in ranked[1 : args.top + 1]:
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark building run_query SQL directly against rendering sql.txt.
+
+Times the Jinja render of templates/sql.txt, the direct builder run_query
+now uses, and a full run_query call on a small frame (where a query takes a
+few milliseconds in DuckDB). Builder and template output are checked to be
+identical first. Run with:
+
+    python benchmarks/bench_sql_builder.py --calls 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pandas as pd
+from jinja2 import Environment, PackageLoader, select_autoescape
+from main import List, _build_sql
+
+ARGS = dict(
+    select=['"name"', "dept_name", "COUNT(*) AS n"],
+    table="current_df",
+    where=["age > ?", "dept_name <> ?"],
+    group_by=['"name"', "dept_name"],
+    having="COUNT(*) > 0",
+    order_by=["n DESC"],
+    limit=10,
+    offset=None,
+    joins=[{"type": "INNER", "table": "departments", "using": ["dept_id"]}],
+)
+
+
+def per_call(fn, calls: int) -> float:
+    """Return mean microseconds per call of fn."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20_000)
+    args = parser.parse_args()
+
+    env = Environment(loader=PackageLoader("main"), autoescape=select_autoescape())
+    template = env.get_template("sql.txt")
+    if template.render(**ARGS) != _build_sql(**ARGS):
+        raise SystemExit("builder output differs from the template")
+
+    jinja_us = per_call(lambda: template.render(**ARGS), args.calls)
+    build_us = per_call(lambda: _build_sql(**ARGS), args.calls)
+
+    people = pd.DataFrame(
+        {"name": ["a", "b", "c", "d"], "age": [30, 40, 50, 60], "dept_id": [1, 2, 1, 2]}
+    )
+    depts = pd.DataFrame({"dept_id": [1, 2], "dept_name": ["Eng", "Ops"]})
+    lst = List(people)
+    lst.register_table("departments", depts)
+    spec = dict(
+        select=["name", "dept_name", "COUNT(*) AS n"],
+        where=["age > ?", "dept_name <> ?"],
+        group_by=['"name"', "dept_name"],
+        joins=ARGS["joins"],
+        params=[35, "HR"],
+    )
+
+    def query():
+        lst.run_query(**spec)
+        lst.df = people
+        lst.register()
+
+    query_us = per_call(query, max(args.calls // 100, 10))
+    lst.close()
+
+    print(f"jinja render      {jinja_us:8.1f} us/call")
+    print(f"direct builder    {build_us:8.1f} us/call ({jinja_us / build_us:.0f}x)")
+    print(
+        f"run_query (small) {query_us:8.1f} us/call; the render saving is "
+        f"{(jinja_us - build_us) / query_us:.1%} of it"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+"""Benchmark List methods, run_query and the pivot/unpivot emitters against pandas.
+
+The sales and employee frames of tests/test_utils.DataGenerator are scaled to
+each requested row count (1M, 10M and 50M by default). Every case is timed
+through DuckQuery and through the equivalent plain pandas code, and the
+results are written as JSON so that two runs (e.g. before and after a pandas
+or DuckDB upgrade) can be compared. Run with:
+
+    python benchmarks/bench_suite.py --rows 1000000 --output bench.json
+    python benchmarks/bench_suite.py --rows 1000000 --compare bench.json
+
+Frame generation is not timed, and neither is building a List and
+registering its tables: each List case reuses one List and puts the base
+frame back as current_df between repeats, so only the method call is timed
+and repeats do not see each other's results.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import duckdb
+import numpy as np
+import pandas as pd
+from main import List, Outlier
+from m_ast.emit import pivot_basic, pivot_native, unpivot_basic, unpivot_native
+
+REGIONS = ["North", "South", "East", "West"]
+PRODUCTS = ["Product_A", "Product_B", "Product_C", "Product_D"]
+DEPARTMENTS = ["Engineering", "Sales", "Marketing", "HR", "Finance"]
+
+
+def sales_data(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """DataGenerator.create_sales_data at scale.
+
+    Dates advance by the minute instead of by the day so that tens of
+    millions of rows stay within the pandas Timestamp range.
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "id": np.arange(1, n_rows + 1),
+            "date": pd.date_range("2024-01-01", periods=n_rows, freq="min"),
+            "region": rng.choice(REGIONS, n_rows),
+            "product": rng.choice(PRODUCTS, n_rows),
+            "sales_amount": rng.uniform(100, 10000, n_rows),
+            "quantity": rng.integers(1, 100, n_rows),
+            "discount": rng.uniform(0, 0.3, n_rows),
+        }
+    )
+
+
+def employee_data(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """DataGenerator.create_employee_data at scale."""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(1, n_rows + 1)
+    return pd.DataFrame(
+        {
+            "id": ids,
+            "name": pd.Series(ids - 1).astype(str).radd("Employee_"),
+            "age": rng.integers(22, 65, n_rows),
+            "salary": rng.integers(40000, 120000, n_rows),
+            "department": rng.choice(DEPARTMENTS, n_rows),
+            "years_experience": rng.integers(0, 20, n_rows),
+            "performance_rating": rng.uniform(1.0, 5.0, n_rows),
+        }
+    )
+
+
+REGION_DIM = pd.DataFrame(
+    {"region": REGIONS, "manager": ["Ann", "Ben", "Cat", "Dan"], "target": range(4)}
+)
+DEPARTMENT_DIM = pd.DataFrame(
+    {"department": DEPARTMENTS, "floor": range(1, len(DEPARTMENTS) + 1)}
+)
+
+
+class _OnList:
+    """Time fn on a List over frame; building and resetting it is not timed.
+
+    setup() builds the List on first use and otherwise puts frame back as
+    current_df, so each repeat of a transform starts from the same input.
+    """
+
+    def __init__(self, frame: pd.DataFrame, fn, *tables: tuple) -> None:
+        self.frame, self.fn, self.tables = frame, fn, tables
+        self.lst = None
+
+    def setup(self) -> None:
+        if self.lst is None:
+            self.lst = List(self.frame)
+            for name, table in self.tables:
+                self.lst.register_table(name, table)
+        else:
+            self.lst.df = self.frame
+            self.lst.register()
+
+    def __call__(self):
+        out = self.fn(self.lst)
+        return len(out._frame) if isinstance(out, List) else 1
+
+    def close(self) -> None:
+        if self.lst is not None:
+            self.lst.close()
+            self.lst = None
+
+
+def _iqr_high(series: pd.Series) -> float:
+    q1, q3 = series.quantile([0.25, 0.75])
+    return q3 + 1.5 * (q3 - q1)
+
+
+def list_cases(sales: pd.DataFrame, employees: pd.DataFrame) -> list:
+    """(name, duckquery callable, pandas callable) for the List methods."""
+    regions = ("regions", REGION_DIM)
+    departments = ("departments", DEPARTMENT_DIM)
+    return [
+        (
+            "filter",
+            _OnList(sales, lambda lst: lst.filter("sales_amount > 5000")),
+            lambda: len(sales[sales["sales_amount"] > 5000]),
+        ),
+        (
+            "select",
+            _OnList(sales, lambda lst: lst.select(["region", "sales_amount"])),
+            lambda: len(sales[["region", "sales_amount"]]),
+        ),
+        (
+            "order",
+            _OnList(sales, lambda lst: lst.order(["sales_amount DESC"])),
+            lambda: len(sales.sort_values("sales_amount", ascending=False)),
+        ),
+        (
+            "limit",
+            _OnList(sales, lambda lst: lst.limit(1000)),
+            lambda: len(sales.head(1000)),
+        ),
+        (
+            "mean",
+            _OnList(sales, lambda lst: lst.mean("sales_amount").value),
+            lambda: sales["sales_amount"].mean(),
+        ),
+        (
+            "stdev_s",
+            _OnList(sales, lambda lst: lst.stdev_s("sales_amount").value),
+            lambda: sales["sales_amount"].std(),
+        ),
+        (
+            "quantile",
+            _OnList(sales, lambda lst: lst.quantile("sales_amount", 0.9).value),
+            lambda: sales["sales_amount"].quantile(0.9),
+        ),
+        (
+            "outlier",
+            _OnList(sales, lambda lst: lst.outlier("quantity", Outlier.HIGH).value),
+            lambda: _iqr_high(sales["quantity"]),
+        ),
+        (
+            "median_of_means",
+            _OnList(
+                sales, lambda lst: lst.median_of_means("region", "sales_amount").value
+            ),
+            lambda: sales.groupby("region")["sales_amount"].mean().median(),
+        ),
+        (
+            "stats",
+            _OnList(
+                sales,
+                lambda lst: lst.stats(
+                    {"sales_amount": ["mean", "stdev_s", 0.5], "quantity": ["max"]}
+                ),
+            ),
+            lambda: (
+                sales["sales_amount"].agg(["mean", "std", "median"]),
+                sales["quantity"].max(),
+            ),
+        ),
+        (
+            "run_query_group_by",
+            _OnList(
+                sales,
+                lambda lst: lst.run_query(
+                    select=["region", "product", "SUM(sales_amount) AS total"],
+                    group_by=["region", "product"],
+                ),
+            ),
+            lambda: len(
+                sales.groupby(["region", "product"], as_index=False)[
+                    "sales_amount"
+                ].sum()
+            ),
+        ),
+        (
+            "run_query_join_group_by",
+            _OnList(
+                sales,
+                lambda lst: lst.run_query(
+                    select=["manager", "SUM(sales_amount) AS total"],
+                    joins=[{"type": "INNER", "table": "regions", "using": ["region"]}],
+                    group_by=["manager"],
+                ),
+                regions,
+            ),
+            lambda: len(
+                sales.merge(REGION_DIM, on="region")
+                .groupby("manager", as_index=False)["sales_amount"]
+                .sum()
+            ),
+        ),
+        (
+            "run_query_join_filter",
+            _OnList(
+                employees,
+                lambda lst: lst.run_query(
+                    select=["name", "salary", "floor"],
+                    joins=[
+                        {
+                            "type": "INNER",
+                            "table": "departments",
+                            "using": ["department"],
+                        }
+                    ],
+                    where=["age > 40", "floor > 2"],
+                ),
+                departments,
+            ),
+            lambda: len(
+                employees[employees["age"] > 40]
+                .merge(DEPARTMENT_DIM, on="department")
+                .query("floor > 2")[["name", "salary", "floor"]]
+            ),
+        ),
+    ]
+
+
+def emit_cases(sales: pd.DataFrame) -> list:
+    """(name, duckquery callable, pandas callable) for the pivot/unpivot SQL."""
+    con = duckdb.connect()
+    con.register("sales", sales)
+    con.execute(
+        "CREATE VIEW pivot_input AS SELECT region, product, sales_amount FROM sales"
+    )
+    measures = ["sales_amount", "quantity", "discount"]
+    con.execute(
+        f"CREATE VIEW unpivot_input AS SELECT id, {', '.join(measures)} FROM sales"
+    )
+
+    def sql(query: str):
+        return lambda: len(con.execute(query).fetch_arrow_table())
+
+    return [
+        (
+            "pivot_basic",
+            sql(pivot_basic("pivot_input", "product", "sales_amount", "SUM", PRODUCTS)),
+            lambda: len(sales.groupby("product")["sales_amount"].sum()),
+        ),
+        (
+            "pivot_native",
+            sql(
+                pivot_native("pivot_input", "product", "sales_amount", "SUM", PRODUCTS)
+            ),
+            lambda: len(
+                sales.pivot_table(
+                    index="region",
+                    columns="product",
+                    values="sales_amount",
+                    aggfunc="sum",
+                )
+            ),
+        ),
+        (
+            "unpivot_basic",
+            sql(unpivot_basic("unpivot_input", measures, "attribute", "value")),
+            lambda: len(
+                sales.melt(id_vars=["id"], value_vars=measures, var_name="attribute")
+            ),
+        ),
+        (
+            "unpivot_native",
+            sql(unpivot_native("unpivot_input", measures, "attribute", "value")),
+            lambda: len(
+                sales.melt(id_vars=["id"], value_vars=measures, var_name="attribute")
+            ),
+        ),
+    ], con
+
+
+def timed(fn, repeat: int) -> dict:
+    """Return the best and mean seconds of *repeat* calls and the last result.
+
+    If fn has a setup() method it is called, untimed, before every call.
+    """
+    setup = getattr(fn, "setup", None)
+    times = []
+    result = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return {"best_s": min(times), "mean_s": sum(times) / len(times), "result": result}
+
+
+def run(rows: list, repeat: int, only: set) -> list:
+    results = []
+    for n_rows in rows:
+        sales = sales_data(n_rows)
+        employees = employee_data(n_rows)
+        cases, con = emit_cases(sales)
+        cases = list_cases(sales, employees) + cases
+        for name, duck, pandas in cases:
+            if only and name not in only:
+                continue
+            try:
+                d = timed(duck, repeat)
+            finally:
+                if isinstance(duck, _OnList):
+                    duck.close()
+            p = timed(pandas, repeat)
+            results.append(
+                {
+                    "case": name,
+                    "rows": n_rows,
+                    "duckquery_s": d["best_s"],
+                    "duckquery_mean_s": d["mean_s"],
+                    "pandas_s": p["best_s"],
+                    "pandas_mean_s": p["mean_s"],
+                    "speedup": p["best_s"] / d["best_s"] if d["best_s"] else None,
+                }
+            )
+            print(
+                f"{name:<26} rows={n_rows:<10} duckquery {d['best_s'] * 1000:9.1f} ms"
+                f"  pandas {p['best_s'] * 1000:9.1f} ms"
+                f"  ({results[-1]['speedup']:.1f}x)",
+                flush=True,
+            )
+        con.close()
+        del sales, employees, cases
+    return results
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(__file__),
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "duckdb": duckdb.__version__,
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(results: list, baseline_path: str) -> None:
+    """Print how each case changed against a previous JSON run."""
+    with open(baseline_path) as fh:
+        baseline = {(r["case"], r["rows"]): r for r in json.load(fh)["results"]}
+    print(f"\ncompared with {baseline_path} (ratio > 1 means slower now):")
+    for r in results:
+        old = baseline.get((r["case"], r["rows"]))
+        if old is None:
+            continue
+        ratio = r["duckquery_s"] / old["duckquery_s"]
+        print(
+            f"{r['case']:<26} rows={r['rows']:<10} "
+            f"{old['duckquery_s'] * 1000:9.1f} ms -> "
+            f"{r['duckquery_s'] * 1000:9.1f} ms  ({ratio:.2f})"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[1_000_000, 10_000_000, 50_000_000],
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="*", default=[], help="case names to run")
+    parser.add_argument("--output", default="bench_suite.json")
+    parser.add_argument("--compare", help="previous JSON output to compare with")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.repeat, set(args.only))
+    report = {"environment": environment(), "repeat": args.repeat, "results": results}
+    with open(args.output, "w") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"wrote {len(results)} results to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
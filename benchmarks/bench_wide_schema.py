@@ -0,0 +1,62 @@
+"""Benchmark run_query select qualification on wide schemas.
+
+Builds a current_df with thousands of columns plus several joined tables
+and times run_query when every select item needs qualifying. Run with:
+
+    python benchmarks/bench_wide_schema.py --columns 3000 --tables 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pandas as pd
+from main import List
+
+
+def wide_frame(n_cols: int, prefix: str, n_rows: int = 10) -> pd.DataFrame:
+    data = {f"{prefix}{i}": range(n_rows) for i in range(n_cols)}
+    data["key"] = range(n_rows)
+    return pd.DataFrame(data)
+
+
+def bench(n_cols: int, n_tables: int, n_select: int, repeat: int) -> float:
+    """Return the mean seconds per run_query call."""
+    with List(wide_frame(n_cols, "c")) as lst:
+        for t in range(n_tables):
+            lst.register_table(f"t{t}", wide_frame(n_cols, f"t{t}_"))
+        # Half the select items live in current_df, half in a joined table
+        select = [f"c{i}" for i in range(n_select // 2)]
+        select += [f"t0_{i}" for i in range(n_select - len(select))]
+        joins = [{"type": "INNER", "table": "t0", "using": ["key"]}]
+        base = lst.data()
+        elapsed = 0.0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            lst.run_query(select=select, joins=joins)
+            elapsed += time.perf_counter() - start
+            # Re-registering the wide base frame is not part of the measurement
+            lst.df = base
+            lst.register()
+        return elapsed / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--columns", type=int, default=3000)
+    parser.add_argument("--tables", type=int, default=5)
+    parser.add_argument("--select", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    seconds = bench(args.columns, args.tables, args.select, args.repeat)
+    print(
+        f"columns={args.columns} tables={args.tables} select={args.select}: "
+        f"{seconds * 1000:.2f} ms per run_query"
+    )
+
+
+if __name__ == "__main__":
+    main()
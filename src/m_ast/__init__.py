@@ -15,6 +15,9 @@ from .nodes import (
     Unpivot,
     Buffer,
 )
+from .compiler import compile_plan
+from .frozen import freeze
+from .optimize import optimize
 
 __all__ = [
     "SelectRows",
@@ -27,6 +30,9 @@ __all__ = [
     "Unpivot",
     "Buffer",
     "explain_step",
+    "compile_plan",
+    "freeze",
+    "optimize",
 ]
 
 
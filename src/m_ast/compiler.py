@@ -0,0 +1,419 @@
+"""Fold chains of m_ast nodes into a single DuckDB SQL statement.
+
+Each node is folded into the SELECT being built for its input when that keeps
+the meaning unchanged (a filter over a plain projection becomes a WHERE
+condition, a projection over a plain SELECT replaces its select list, and so
+on). Otherwise the input is nested as a subquery. Pivot and Unpivot read their
+input from a CTE and use DuckDB's native PIVOT/UNPIVOT, and Buffer becomes a
+MATERIALIZED CTE so nothing is folded across it. The result is one
+statement that DuckDB plans and runs in one go.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from .emit import pivot_native, unpivot_native
+from .frozen import FrozenNode
+from .ident import quote
+from .nodes import (
+    AddColumn,
+    Buffer,
+    Group,
+    Join,
+    Pivot,
+    RenameColumns,
+    SelectColumns,
+    SelectRows,
+    Unpivot,
+)
+
+PLAN_NODES = (
+    SelectRows,
+    SelectColumns,
+    AddColumn,
+    RenameColumns,
+    Group,
+    Join,
+    Pivot,
+    Unpivot,
+    Buffer,
+)
+
+_JOIN_KINDS = {
+    "inner": "INNER JOIN",
+    "left": "LEFT JOIN",
+    "right": "RIGHT JOIN",
+    "full": "FULL OUTER JOIN",
+}
+
+
+class _Block:
+    """A single SELECT under construction.
+
+    `plain` is True while the select list only passes source columns through
+    unchanged, so filters, projections and grouping can still be merged into
+    this SELECT instead of wrapping it.
+    """
+
+    __slots__ = ("select", "source", "where", "group_by", "plain")
+
+    def __init__(self, source: str) -> None:
+        self.select = ["*"]
+        self.source = source
+        self.where: list[str] = []
+        self.group_by: list[str] = []
+        self.plain = True
+
+    @property
+    def foldable(self) -> bool:
+        return self.plain and not self.group_by
+
+    @property
+    def bare(self) -> bool:
+        """True if the block is just `SELECT * FROM source`."""
+        return self.select == ["*"] and not self.where and not self.group_by
+
+    def sql(self) -> str:
+        parts = [f"SELECT {', '.join(self.select)} FROM {self.source}"]
+        if self.where:
+            if len(self.where) == 1:
+                parts.append(f"WHERE {self.where[0]}")
+            else:
+                parts.append("WHERE " + " AND ".join(f"({c})" for c in self.where))
+        if self.group_by:
+            parts.append(f"GROUP BY {', '.join(self.group_by)}")
+        return " ".join(parts)
+
+
+# Generated names carry their number between NUL marks until statement()
+# resolves them, so the SQL of a frozen subtree can be cached and spliced
+# into any plan by shifting its numbers past the names already used
+_MARK = "\x00"
+_MARK_RE = re.compile(_MARK + r"(\d+)" + _MARK)
+
+
+# Compiled frozen subtrees by node, oldest first
+_fragments: dict = {}
+_FRAGMENT_LIMIT = 4096
+
+
+def _fragment(block: "_Block", ctes: list, used: int) -> tuple:
+    """Snapshot a compiled block, the CTEs it added and the names it used."""
+    return (
+        tuple(block.select),
+        block.source,
+        tuple(block.where),
+        tuple(block.group_by),
+        block.plain,
+        tuple(ctes),
+        used,
+    )
+
+
+def _shifted(fragment: tuple, offset: int) -> tuple:
+    """Return *fragment* with the numbers of its generated names moved."""
+    if not offset:
+        return fragment
+    select, source, where, group_by, plain, ctes, used = fragment
+
+    def shift(text: str) -> str:
+        return _MARK_RE.sub(lambda m: f"{_MARK}{int(m[1]) + offset}{_MARK}", text)
+
+    return (
+        tuple(map(shift, select)),
+        shift(source),
+        tuple(map(shift, where)),
+        tuple(map(shift, group_by)),
+        plain,
+        tuple((shift(name), shift(sql), mat) for name, sql, mat in ctes),
+        used,
+    )
+
+
+# Called with a Buffer node and the SQL of its input; returns the name of a
+# table holding that input, or None to inline it as a MATERIALIZED CTE
+BufferHook = Callable[[Buffer, str], Optional[str]]
+# Called with a Pivot node without values and the SQL of its input; returns
+# the pivot values, or None to let DuckDB discover them at run time
+PivotValuesHook = Callable[[Pivot, str], Optional[list]]
+
+
+class _Compiler:
+    def __init__(
+        self,
+        buffer: Optional[BufferHook] = None,
+        pivot_values: Optional[PivotValuesHook] = None,
+    ) -> None:
+        self.ctes: list[tuple[str, str, bool]] = []
+        self.buffer = buffer
+        self.pivot_values = pivot_values
+        # Hooks depend on caller state, so only hook-free compiles share the
+        # SQL of frozen subtrees
+        self.memo = buffer is None and pivot_values is None
+        self._n = 0
+
+    def _name(self, prefix: str) -> str:
+        self._n += 1
+        return f"_{prefix}{_MARK}{self._n}{_MARK}"
+
+    def _nest(self, block: _Block) -> _Block:
+        """Start a new SELECT reading *block* as a subquery."""
+        return _Block(f"({block.sql()}) AS {self._name('q')}")
+
+    def _cte(self, block: _Block, materialized: bool = False) -> str:
+        """Move *block* into a CTE and return the CTE's (unquoted) name."""
+        src = block.source
+        if not materialized and block.bare and _is_quoted_name(src):
+            return src[1:-1].replace('""', '"')
+        name = self._name("s")
+        self.ctes.append((name, block.sql(), materialized))
+        return name
+
+    def _relation(self, block: _Block) -> str:
+        """Return *block* as something usable in a FROM clause."""
+        if block.bare and _is_quoted_name(block.source):
+            return block.source
+        # Anything else (a join source, an aliased subquery) becomes a
+        # subquery so it can take an alias of its own
+        return f"({block.sql()})"
+
+    def _splice(self, fragment: tuple) -> _Block:
+        """Add a cached subtree, numbering its names after those in use."""
+        select, source, where, group_by, plain, ctes, used = _shifted(fragment, self._n)
+        block = _Block(source)
+        block.select, block.where = list(select), list(where)
+        block.group_by, block.plain = list(group_by), plain
+        self.ctes.extend(ctes)
+        self._n += used
+        return block
+
+    def compile(self, node: Any, memo: bool = True) -> _Block:
+        if memo and self.memo and isinstance(node, FrozenNode):
+            fragment = _fragments.get(node)
+            if fragment is not None:
+                return self._splice(fragment)
+            start, first_cte = self._n, len(self.ctes)
+            block = self.compile(node, memo=False)
+            fragment = _fragment(block, self.ctes[first_cte:], self._n - start)
+            # Cache the subtree with its names numbered from 1
+            if len(_fragments) >= _FRAGMENT_LIMIT:
+                _fragments.pop(next(iter(_fragments)), None)
+            _fragments[node] = _shifted(fragment, -start)
+            return block
+        if isinstance(node, str):
+            return _Block(quote(node))
+        if not isinstance(node, PLAN_NODES):
+            name = getattr(node, "__name__", None)
+            if isinstance(name, str):
+                return _Block(quote(name))
+            raise TypeError(f"Cannot compile plan input: {node!r}")
+
+        if isinstance(node, Join):
+            return self._join(node)
+        if isinstance(node, Buffer):
+            return self._buffer(node)
+        if isinstance(node, Pivot):
+            return self._pivot(node)
+
+        block = self.compile(node.table)
+
+        if isinstance(node, SelectRows):
+            if not block.foldable:
+                block = self._nest(block)
+            block.where.append(node.condition)
+        elif isinstance(node, SelectColumns):
+            if not block.foldable:
+                block = self._nest(block)
+            block.select = [quote(c) for c in node.columns]
+        elif isinstance(node, AddColumn):
+            if not block.foldable:
+                block = self._nest(block)
+            block.select = block.select + [
+                f"{node.expression} AS {quote(node.new_column)}"
+            ]
+            block.plain = False
+        elif isinstance(node, RenameColumns):
+            if not block.foldable:
+                block = self._nest(block)
+            if block.select == ["*"]:
+                renames = ", ".join(
+                    f"{quote(old)} AS {quote(new)}" for old, new in node.mapping.items()
+                )
+                block.select = [f"* RENAME ({renames})"]
+            else:
+                block.select = [
+                    _rename_item(item, node.mapping) for item in block.select
+                ]
+            block.plain = False
+        elif isinstance(node, Group):
+            if not block.foldable:
+                block = self._nest(block)
+            keys = [quote(k) for k in node.keys]
+            aggs = [f"{expr} AS {quote(name)}" for name, expr in node.aggs.items()]
+            block.select = keys + aggs
+            block.group_by = keys
+        elif isinstance(node, Unpivot):
+            sql = unpivot_native(
+                self._cte(block),
+                node.columns,
+                node.attribute_column,
+                node.value_column,
+            )
+            block = _Block(f"({sql}) AS {self._name('q')}")
+        return block
+
+    def _subplan(self, node: Any) -> tuple["_Compiler", _Block]:
+        """Compile *node* on its own so its SQL is a complete statement."""
+        sub = _Compiler(self.buffer, self.pivot_values)
+        sub._n = self._n
+        block = sub.compile(node)
+        self._n = sub._n
+        return sub, block
+
+    def _buffer(self, node: Buffer) -> _Block:
+        sub, block = self._subplan(node.table)
+        table = self.buffer(node, sub.statement(block)) if self.buffer else None
+        if table is not None:
+            return _Block(quote(table))
+        self.ctes.extend(sub.ctes)
+        return _Block(quote(self._cte(block, materialized=True)))
+
+    def _pivot(self, node: Pivot) -> _Block:
+        sub, block = self._subplan(node.table)
+        values = node.values
+        if not values and self.pivot_values is not None:
+            values = self.pivot_values(node, sub.statement(block))
+        self.ctes.extend(sub.ctes)
+        sql = pivot_native(
+            self._cte(block), node.pivot_column, node.value_column, node.agg, values
+        )
+        return _Block(f"({sql}) AS {self._name('q')}")
+
+    def statement(self, block: _Block) -> str:
+        """Return *block* as a full statement, preceded by the CTEs it uses."""
+        body = block.sql()
+        if self.ctes:
+            ctes = ", ".join(
+                f"{quote(name)} AS {'MATERIALIZED ' if mat else ''}({sql})"
+                for name, sql, mat in self.ctes
+            )
+            body = f"WITH {ctes} {body}"
+        return _MARK_RE.sub(r"\1", body)
+
+    def _join(self, node: Join) -> _Block:
+        left = self._relation(self.compile(node.left))
+        right = self._relation(self.compile(node.right))
+        # Unique aliases, so joins nested in joins do not clash
+        la, ra = self._name("l"), self._name("r")
+        kind = _JOIN_KINDS.get(node.kind.lower(), "INNER JOIN")
+        if all(lcol == rcol for lcol, rcol in node.on.items()):
+            using = ", ".join(quote(c) for c in node.on)
+            source = f"{left} AS {la} {kind} {right} AS {ra} USING ({using})"
+        else:
+            cond = " AND ".join(
+                f"{la}.{quote(lcol)} = {ra}.{quote(rcol)}"
+                for lcol, rcol in node.on.items()
+            )
+            source = f"{left} AS {la} {kind} {right} AS {ra} ON {cond}"
+        return _Block(source)
+
+
+def _is_quoted_name(source: str) -> bool:
+    return len(source) > 1 and source[0] == source[-1] == '"' and " " not in source
+
+
+def _rename_item(item: str, mapping: dict) -> str:
+    """Apply a rename to one quoted column of a plain select list."""
+    for old, new in mapping.items():
+        if item == quote(old):
+            return f"{item} AS {quote(new)}"
+    return item
+
+
+def compile_plan(
+    node: Any,
+    buffer: Optional[BufferHook] = None,
+    pivot_values: Optional[PivotValuesHook] = None,
+) -> str:
+    """Compile a chain of m_ast nodes into one SQL statement.
+
+    Args:
+        node: The last step of the pipeline. Its `table` (or `left`/`right`
+            for Join) is either another node or a table name.
+        buffer: Optional hook that materializes the input of each Buffer
+            node. It receives the node and the SQL of its input and returns
+            the table to read instead, or None to use a MATERIALIZED CTE.
+        pivot_values: Optional hook that supplies the values of a Pivot node
+            whose `values` is None, given the node and the SQL of its input.
+            Without it (or when it returns None) DuckDB discovers the values
+            itself each time the statement runs.
+
+    Returns:
+        A single SELECT statement, with CTEs for Pivot/Unpivot inputs and
+        Buffer boundaries.
+
+    Without hooks, the SQL of every frozen subtree (m_ast.frozen) is
+    memoized on its structural hash: compiling an equal plan again is a
+    dictionary lookup, and a frozen subplan shared by several plans is
+    compiled once and spliced into each, with its generated names renumbered.
+
+    Examples:
+        >>> from m_ast.nodes import SelectRows, SelectColumns
+        >>> compile_plan(SelectColumns(SelectRows("t", "age >= 30"), ["id"]))
+        'SELECT "id" FROM "t" WHERE age >= 30'
+    """
+    if buffer is None and pivot_values is None and isinstance(node, FrozenNode):
+        return _compile_frozen(node)
+    compiler = _Compiler(buffer, pivot_values)
+    return compiler.statement(compiler.compile(node))
+
+
+@lru_cache(maxsize=4096)
+def _compile_frozen(node: FrozenNode) -> str:
+    compiler = _Compiler()
+    return compiler.statement(compiler.compile(node))
+
+
+def _key_value(value: Any) -> Any:
+    if isinstance(value, PLAN_NODES):
+        return plan_key(value)
+    if isinstance(value, dict):
+        return tuple((k, _key_value(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_key_value(v) for v in value)
+    if isinstance(value, str):
+        return value
+    return getattr(value, "__name__", None) or repr(value)
+
+
+def plan_key(node: Any) -> tuple:
+    """Return a hashable key describing the structure of a plan.
+
+    Two plans that compile to the same SQL have equal keys.
+    """
+    if isinstance(node, FrozenNode):
+        return _frozen_plan_key(node)
+    fields = getattr(node, "__dataclass_fields__", None)
+    if fields is None:
+        return (_key_value(node),)
+    return (type(node).__name__,) + tuple(_key_value(getattr(node, f)) for f in fields)
+
+
+@lru_cache(maxsize=4096)
+def _frozen_plan_key(node: FrozenNode) -> tuple:
+    return (type(node).__name__,) + tuple(
+        _key_value(getattr(node, f)) for f in node.__match_args__
+    )
+
+
+def plan_tables(node: Any) -> set:
+    """Return the names of the tables a plan reads."""
+    if isinstance(node, Join):
+        return plan_tables(node.left) | plan_tables(node.right)
+    if isinstance(node, PLAN_NODES):
+        return plan_tables(node.table)
+    if isinstance(node, str):
+        return {node}
+    name = getattr(node, "__name__", None)
+    return {name} if isinstance(name, str) else set()
@@ -200,6 +200,42 @@ def pivot_basic(
     return f'SELECT {select_list} FROM "{table_name}"'
 
 
+def _pivot_literal(value) -> str:
+    """Render one pivot value for an IN list."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return repr(value)
+    text = str(value).replace("'", "''")
+    return f"'{text}'"
+
+
+def pivot_native(
+    table_name: str,
+    pivot_column: str,
+    value_column: str,
+    agg: str,
+    values: list | None = None,
+) -> str:
+    """Generate pivot SQL using DuckDB's native PIVOT statement.
+
+    - table_name: source table
+    - pivot_column: column whose distinct values become new columns
+    - value_column: column providing the values to aggregate
+    - agg: aggregate function (e.g., 'SUM', 'COUNT')
+    - values: optional list of pivot values; if None, DuckDB discovers them
+      when the statement runs (which rules out bound parameters)
+
+    Every other column of the source becomes a group key. Returns a PIVOT
+    statement that can be used as a subquery.
+    """
+    source = f'"{table_name}"'
+    on = f'"{pivot_column}"'
+    if values:
+        on += f" IN ({', '.join(_pivot_literal(v) for v in values)})"
+    return f'PIVOT {source} ON {on} USING {agg.upper()}("{value_column}")'
+
+
 def unpivot_basic(
     table_name: str,
     columns: list[str],
@@ -228,3 +264,46 @@ def unpivot_basic(
         union_queries.append(query)
 
     return " UNION ALL ".join(union_queries)
+
+
+def unpivot_native(
+    table_name: str,
+    columns: list[str],
+    attribute_column: str,
+    value_column: str,
+) -> str:
+    """Generate unpivot SQL using DuckDB's UNPIVOT clause.
+
+    - table_name: source table
+    - columns: list of column names to unpivot into rows
+    - attribute_column: name of the output attribute column (e.g., 'attribute')
+    - value_column: name of the output value column (e.g., 'value')
+
+    Returns the same rows as unpivot_basic (NULL values included), but the
+    source is scanned once instead of once per column. UNPIVOT rejects
+    columns of different types, so several columns are first brought to the
+    type UNION ALL would give them, through an empty UNION ALL branch that
+    DuckDB removes when planning.
+    """
+    if not columns:
+        raise ValueError("unpivot_native requires a non-empty 'columns' list")
+
+    source = f'"{table_name}"'
+    cols = ", ".join([f'"{c}"' for c in columns])
+    if len(columns) > 1:
+        # _common has the supertype of every column; unioning each column
+        # with it gives them all that type
+        common = " UNION ALL ".join(
+            f'SELECT "{c}"{" AS _common" if i == 0 else ""} FROM {source} WHERE false'
+            for i, c in enumerate(columns)
+        )
+        typed = ", ".join(["_common"] * len(columns))
+        source = (
+            f"(SELECT {cols} FROM {source} "
+            f"UNION ALL SELECT {typed} FROM ({common}))"
+        )
+    return (
+        f'SELECT "{attribute_column}", "{value_column}" FROM {source} '
+        f'UNPIVOT INCLUDE NULLS ("{value_column}" FOR "{attribute_column}" '
+        f"IN ({cols}))"
+    )
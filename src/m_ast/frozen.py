@@ -0,0 +1,244 @@
+"""Frozen, slotted and structurally hashed variants of the m_ast nodes.
+
+Each class here has the same name and fields as its counterpart in
+m_ast.nodes and is registered as a virtual subclass of it, so the compiler,
+optimizer and explain_step treat both alike. Frozen nodes differ in that:
+
+- they are immutable and use ``__slots__``, so large pipelines are smaller;
+- lists become tuples and dicts become read-only dicts, and mutable child
+  nodes are frozen as well;
+- equality is structural and the hash is computed once when the node is
+  built, so hashing a pipeline costs O(1) and nodes can key caches.
+
+compile_plan memoizes the SQL of every frozen subtree compiled without hooks,
+so compiling the same subplan again, alone or inside another plan, is a
+dictionary lookup. Build frozen pipelines directly or convert an existing one
+with freeze().
+
+Table references (the leaves) must be hashable, e.g. table names.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+from . import nodes
+
+
+class FrozenDict(dict):
+    """A read-only dict with an order-sensitive hash and equality.
+
+    Order matters for the node fields that hold dicts (aggregations, join
+    keys, renames), since it decides the column order of the output.
+    """
+
+    __slots__ = ("_hash",)
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._hash = hash(tuple(self.items()))
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FrozenDict) and other._hash != self._hash:
+            return False
+        return dict.__eq__(self, other) is True and list(self) == list(other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("FrozenDict is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+
+def _freeze_value(value: Any, memo: Dict[int, Any]) -> Any:
+    if isinstance(value, FrozenNode):
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze_value(v, memo) for v in value)
+    if isinstance(value, dict) and not isinstance(value, FrozenDict):
+        return FrozenDict((k, _freeze_value(v, memo)) for k, v in value.items())
+    if type(value).__name__ in _FROZEN:
+        return freeze(value, memo)
+    return value
+
+
+class FrozenNode:
+    """Base class of the frozen nodes: normalizes fields and caches the hash."""
+
+    __slots__ = ("_hash",)
+
+    def __post_init__(self) -> None:
+        names = self.__match_args__
+        memo: Dict[int, Any] = {}
+        values = []
+        for name in names:
+            value = getattr(self, name)
+            frozen = _freeze_value(value, memo)
+            if frozen is not value:
+                object.__setattr__(self, name, frozen)
+            values.append(frozen)
+        object.__setattr__(self, "_hash", hash((type(self).__name__, *values)))
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        # Walk the two trees with a stack: deep pipelines compare without
+        # recursing once per node
+        pairs = [(self, other)]
+        while pairs:
+            a, b = pairs.pop()
+            if a is b:
+                continue
+            if type(b) is not type(a) or b._hash != a._hash:
+                return False
+            for name in a.__match_args__:
+                x, y = getattr(a, name), getattr(b, name)
+                if isinstance(x, FrozenNode):
+                    pairs.append((x, y))
+                elif x != y:
+                    return False
+        return True
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    def __reduce__(self):
+        # Rebuild through __init__ so the cached hash is recomputed
+        return (type(self), tuple(getattr(self, n) for n in self.__match_args__))
+
+
+_frozen = dataclass(frozen=True, slots=True, eq=False, repr=False)
+
+
+@_frozen
+class SelectRows(FrozenNode):
+    table: Any
+    condition: str
+
+    __repr__ = nodes.SelectRows.__repr__
+
+
+@_frozen
+class SelectColumns(FrozenNode):
+    table: Any
+    columns: List[str]
+
+    __repr__ = nodes.SelectColumns.__repr__
+
+
+@_frozen
+class AddColumn(FrozenNode):
+    table: Any
+    new_column: str
+    expression: str
+
+    __repr__ = nodes.AddColumn.__repr__
+
+
+@_frozen
+class RenameColumns(FrozenNode):
+    table: Any
+    mapping: Dict[str, str]
+
+    __repr__ = nodes.RenameColumns.__repr__
+
+
+@_frozen
+class Group(FrozenNode):
+    table: Any
+    keys: List[str]
+    aggs: Dict[str, str]
+
+    __repr__ = nodes.Group.__repr__
+
+
+@_frozen
+class Join(FrozenNode):
+    left: Any
+    right: Any
+    on: Dict[str, str]
+    kind: str = "inner"
+
+    __repr__ = nodes.Join.__repr__
+
+
+@_frozen
+class Pivot(FrozenNode):
+    table: Any
+    pivot_column: str
+    value_column: str
+    agg: str
+    values: List[str] | None = None
+
+    __repr__ = nodes.Pivot.__repr__
+
+
+@_frozen
+class Unpivot(FrozenNode):
+    table: Any
+    columns: List[str]
+    attribute_column: str
+    value_column: str
+
+    __repr__ = nodes.Unpivot.__repr__
+
+
+@_frozen
+class Buffer(FrozenNode):
+    table: Any
+
+    __repr__ = nodes.Buffer.__repr__
+
+
+_FROZEN = {
+    cls.__name__: cls
+    for cls in (
+        SelectRows,
+        SelectColumns,
+        AddColumn,
+        RenameColumns,
+        Group,
+        Join,
+        Pivot,
+        Unpivot,
+        Buffer,
+    )
+}
+for _name, _cls in _FROZEN.items():
+    getattr(nodes, _name).register(_cls)
+
+
+def freeze(node: Any, memo: Dict[int, Any] | None = None) -> Any:
+    """Return the frozen equivalent of an m_ast pipeline.
+
+    Frozen nodes and table references are returned unchanged. A subtree that
+    is shared within the pipeline is frozen once and stays shared.
+
+    Examples:
+        >>> from m_ast.nodes import SelectRows
+        >>> freeze(SelectRows("t", "a > 1")) == freeze(SelectRows("t", "a > 1"))
+        True
+    """
+    if isinstance(node, FrozenNode):
+        return node
+    cls = _FROZEN.get(type(node).__name__)
+    if cls is None or not isinstance(node, getattr(nodes, cls.__name__)):
+        return node
+    memo = {} if memo is None else memo
+    frozen = memo.get(id(node))
+    if frozen is None:
+        fields = {
+            name: _freeze_value(getattr(node, name), memo)
+            for name in cls.__match_args__
+        }
+        frozen = memo[id(node)] = cls(**fields)
+    return frozen
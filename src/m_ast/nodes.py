@@ -1,10 +1,14 @@
+from abc import ABCMeta
 from dataclasses import dataclass
 from typing import Any
 from typing import List, Dict
 
+# The node classes use ABCMeta so that the frozen variants in m_ast.frozen can
+# register as virtual subclasses and pass the same isinstance checks.
+
 
 @dataclass
-class SelectRows:
+class SelectRows(metaclass=ABCMeta):
     """AST node representing a Table.SelectRows operation.
 
     Fields:
@@ -21,7 +25,7 @@ class SelectRows:
 
 
 @dataclass
-class SelectColumns:
+class SelectColumns(metaclass=ABCMeta):
     """AST node representing a Table.SelectColumns operation.
 
     Fields:
@@ -39,7 +43,7 @@ class SelectColumns:
 
 
 @dataclass
-class AddColumn:
+class AddColumn(metaclass=ABCMeta):
     """AST node representing a Table.AddColumn operation.
 
     Fields:
@@ -61,7 +65,7 @@ class AddColumn:
 
 
 @dataclass
-class RenameColumns:
+class RenameColumns(metaclass=ABCMeta):
     """AST node representing a Table.RenameColumns operation.
 
     Fields:
@@ -78,7 +82,7 @@ class RenameColumns:
 
 
 @dataclass
-class Group:
+class Group(metaclass=ABCMeta):
     """AST node representing a Table.Group operation.
 
     Fields:
@@ -99,7 +103,7 @@ class Group:
 
 
 @dataclass
-class Join:
+class Join(metaclass=ABCMeta):
     """AST node representing a Table.Join operation.
 
     Fields:
@@ -121,7 +125,7 @@ class Join:
 
 
 @dataclass
-class Pivot:
+class Pivot(metaclass=ABCMeta):
     """AST node representing a Table.Pivot operation.
 
     Fields:
@@ -148,7 +152,7 @@ class Pivot:
 
 
 @dataclass
-class Unpivot:
+class Unpivot(metaclass=ABCMeta):
     """AST node representing a Table.Unpivot operation.
 
     Fields:
@@ -174,7 +178,7 @@ class Unpivot:
 
 
 @dataclass
-class Buffer:
+class Buffer(metaclass=ABCMeta):
     """AST node representing a Table.Buffer operation.
 
     Fields:
@@ -0,0 +1,407 @@
+"""Rule-based rewrites of m_ast plans, applied before compile_plan.
+
+The optimizer never changes what a plan returns, only where work happens:
+
+- adjacent SelectRows are merged into one condition;
+- filters move below SelectColumns, AddColumn (unless they use the new
+  column) and RenameColumns (rewritten to the old names), and into the input
+  of a Join when every column they use comes from that side;
+- SelectColumns prunes what its input computes: unused AddColumn steps and
+  Group aggregates are dropped and Join inputs are narrowed to the columns
+  still needed.
+
+Buffer is a boundary: nothing is pushed into or pruned across it, but the
+subplan below it is optimized on its own. Conditions using positional
+``?`` parameters are left in place, and steps using them are never pruned,
+since either would change the order in which parameters bind.
+
+Join pushdown and pruning need to know the columns of each side; pass them
+through `schema`, a dict mapping table names to column lists.
+"""
+
+import re
+from dataclasses import replace
+from typing import Any, Dict, List, Optional
+
+from .frozen import FrozenNode, freeze
+from .ident import is_reserved, quote
+from .nodes import (
+    AddColumn,
+    Buffer,
+    Group,
+    Join,
+    Pivot,
+    RenameColumns,
+    SelectColumns,
+    SelectRows,
+    Unpivot,
+)
+
+Schema = Dict[str, List[str]]
+
+_TOKEN_RE = re.compile(
+    r"""'(?:[^']|'')*'          # string literal
+      |"(?:[^"]|"")*"           # quoted identifier
+      |[A-Za-z_][A-Za-z0-9_]*   # word
+      |\s+
+      |.""",
+    re.VERBOSE,
+)
+
+
+def _tokens(expr: str) -> list[str]:
+    return _TOKEN_RE.findall(expr)
+
+
+def _next_significant(tokens: list[str], i: int) -> str:
+    for tok in tokens[i + 1 :]:
+        if not tok.isspace():
+            return tok
+    return ""
+
+
+def _refs(expr: str) -> Optional[set]:
+    """Return the column names *expr* refers to, or None if unsure.
+
+    Function names, keywords and string literals are skipped. Qualified
+    references (``t.col``) return None, so callers leave the expression alone.
+    """
+    tokens = _tokens(expr)
+    refs = set()
+    prev = ""
+    for i, tok in enumerate(tokens):
+        if tok.isspace():
+            continue
+        nxt = _next_significant(tokens, i)
+        name = None
+        if tok.startswith('"'):
+            name = tok[1:-1].replace('""', '"')
+        elif (tok[0].isalpha() or tok[0] == "_") and nxt != "(":
+            if not is_reserved(tok) and tok.upper() not in _KEYWORDS:
+                name = tok
+        if name is not None:
+            if prev == "." or nxt == ".":
+                return None
+            refs.add(name)
+        prev = tok
+    return refs
+
+
+# Words that may appear bare in conditions without naming a column
+_KEYWORDS = frozenset(
+    {
+        "ILIKE",
+        "GLOB",
+        "SIMILAR",
+        "ESCAPE",
+        "INTERVAL",
+        "ISNULL",
+        "NOTNULL",
+        "INTEGER",
+        "BIGINT",
+        "DOUBLE",
+        "VARCHAR",
+        "DATE",
+        "TIMESTAMP",
+        "BOOLEAN",
+    }
+)
+
+
+def _conjuncts(cond: str) -> list[str]:
+    """Split *cond* on its top-level ANDs (BETWEEN ... AND ... is kept)."""
+    parts, current = [], []
+    depth = 0
+    pending_between = False
+    for tok in _tokens(cond):
+        upper = tok.upper()
+        if tok == "(":
+            depth += 1
+        elif tok == ")":
+            depth -= 1
+        elif depth == 0 and upper == "BETWEEN":
+            pending_between = True
+        elif depth == 0 and upper == "AND":
+            if pending_between:
+                pending_between = False
+            else:
+                parts.append("".join(current))
+                current = []
+                continue
+        current.append(tok)
+    parts.append("".join(current))
+    return [_strip_parens(p.strip()) for p in parts if p.strip()]
+
+
+def _strip_parens(expr: str) -> str:
+    """Remove parentheses that wrap all of *expr*."""
+    while expr.startswith("(") and expr.endswith(")"):
+        depth = 0
+        tokens = _tokens(expr)
+        for i, tok in enumerate(tokens):
+            depth += tok == "("
+            depth -= tok == ")"
+            if depth == 0 and i < len(tokens) - 1:
+                return expr
+        expr = expr[1:-1].strip()
+    return expr
+
+
+def _and(conjuncts: list[str]) -> str:
+    if len(conjuncts) == 1:
+        return conjuncts[0]
+    return " AND ".join(f"({c})" for c in conjuncts)
+
+
+def _rename_refs(expr: str, mapping: Dict[str, str]) -> str:
+    """Rewrite column references in *expr* through *mapping*."""
+    tokens = _tokens(expr)
+    out = []
+    for i, tok in enumerate(tokens):
+        name = None
+        if tok.startswith('"'):
+            name = tok[1:-1].replace('""', '"')
+        elif (tok[0].isalpha() or tok[0] == "_") and _next_significant(
+            tokens, i
+        ) != "(":
+            name = tok
+        out.append(quote(mapping[name]) if name in mapping else tok)
+    return "".join(out)
+
+
+def _pinned(expr: str) -> bool:
+    """True if *expr* binds positional parameters and must not move."""
+    return "?" in expr
+
+
+def _columns(node: Any, schema: Schema) -> Optional[List[str]]:
+    """Return the output columns of *node*, or None if they are not known."""
+    if isinstance(node, str):
+        cols = schema.get(node)
+        return list(cols) if cols is not None else None
+    if isinstance(node, SelectColumns):
+        return list(node.columns)
+    if isinstance(node, (SelectRows, Buffer)):
+        return _columns(node.table, schema)
+    if isinstance(node, AddColumn):
+        cols = _columns(node.table, schema)
+        return None if cols is None else cols + [node.new_column]
+    if isinstance(node, RenameColumns):
+        cols = _columns(node.table, schema)
+        return None if cols is None else [node.mapping.get(c, c) for c in cols]
+    if isinstance(node, Group):
+        return list(node.keys) + list(node.aggs)
+    if isinstance(node, Join):
+        left = _columns(node.left, schema)
+        right = _columns(node.right, schema)
+        if left is None or right is None:
+            return None
+        if _using(node):
+            return left + [c for c in right if c not in node.on]
+        return left + right
+    if isinstance(node, Unpivot):
+        return [node.attribute_column, node.value_column]
+    if isinstance(node, Pivot) and node.values:
+        # The remaining input columns become the implicit GROUP BY
+        cols = _columns(node.table, schema)
+        if cols is None:
+            return None
+        used = (node.pivot_column, node.value_column)
+        return [c for c in cols if c not in used] + [str(v) for v in node.values]
+    return None
+
+
+def _using(join: Join) -> bool:
+    """True if the join keys have the same name on both sides (JOIN USING)."""
+    return all(left == right for left, right in join.on.items())
+
+
+def _filter(node: Any, conjuncts: list[str]) -> Any:
+    if not conjuncts:
+        return node
+    if isinstance(node, SelectRows):
+        return replace(node, condition=_and(_conjuncts(node.condition) + conjuncts))
+    return SelectRows(node, _and(conjuncts))
+
+
+def _push(node: Any, conjuncts: list[str], schema: Schema) -> Any:
+    """Move *conjuncts* as far below *node* as they can go.
+
+    Conjuncts with positional parameters stay on top of *node*.
+    """
+    stay = [c for c in conjuncts if _pinned(c)]
+    free = [c for c in conjuncts if not _pinned(c)]
+    return _filter(_push_free(node, free, schema), stay)
+
+
+def _push_free(node: Any, conjuncts: list[str], schema: Schema) -> Any:
+    if not conjuncts:
+        return node
+    if isinstance(node, SelectRows):
+        return _push(node.table, _conjuncts(node.condition) + conjuncts, schema)
+    if isinstance(node, SelectColumns):
+        return replace(node, table=_push_free(node.table, conjuncts, schema))
+
+    movable, stay = [], []
+    if isinstance(node, AddColumn):
+        for c in conjuncts:
+            refs = _refs(c)
+            ok = refs is not None and node.new_column not in refs
+            (movable if ok else stay).append(c)
+        table = _push_free(node.table, movable, schema)
+        return _filter(replace(node, table=table), stay)
+    if isinstance(node, RenameColumns):
+        inverse = {new: old for old, new in node.mapping.items()}
+        for c in conjuncts:
+            if _refs(c) is not None:
+                movable.append(_rename_refs(c, inverse))
+            else:
+                stay.append(c)
+        table = _push_free(node.table, movable, schema)
+        return _filter(replace(node, table=table), stay)
+    if isinstance(node, Join):
+        return _push_join(node, conjuncts, schema)
+    # Group, Pivot, Unpivot, Buffer and tables: the filter stays on top
+    return _filter(node, conjuncts)
+
+
+def _push_join(node: Join, conjuncts: list[str], schema: Schema) -> Any:
+    lcols = _columns(node.left, schema)
+    rcols = _columns(node.right, schema)
+    kind = node.kind.lower()
+    keys = set(node.on) if _using(node) else set()
+    to_left, to_right, stay = [], [], []
+    for c in conjuncts:
+        refs = _refs(c)
+        if refs is None or lcols is None or rcols is None:
+            stay.append(c)
+            continue
+        left_only = refs <= set(lcols) and not (refs & set(rcols)) - keys
+        right_only = refs <= set(rcols) and not refs & set(lcols)
+        if kind == "inner" and keys and refs <= keys:
+            to_left.append(c)
+            to_right.append(c)
+        elif left_only and kind in ("inner", "left"):
+            to_left.append(c)
+        elif right_only and kind in ("inner", "right"):
+            to_right.append(c)
+        else:
+            stay.append(c)
+    joined = replace(
+        node,
+        left=_push_free(node.left, to_left, schema),
+        right=_push_free(node.right, to_right, schema),
+    )
+    return _filter(joined, stay)
+
+
+def _pushdown(node: Any, schema: Schema) -> Any:
+    """Optimize children first, then push this node's filter into them."""
+    if isinstance(node, Join):
+        return replace(
+            node,
+            left=_pushdown(node.left, schema),
+            right=_pushdown(node.right, schema),
+        )
+    if not hasattr(node, "table"):
+        return node
+    node = replace(node, table=_pushdown(node.table, schema))
+    if isinstance(node, SelectRows):
+        return _push(node.table, _conjuncts(node.condition), schema)
+    return node
+
+
+def _prune(node: Any, required: Optional[set], schema: Schema) -> Any:
+    """Drop work whose output columns are not in *required* (None = all)."""
+    if isinstance(node, SelectColumns):
+        cols = node.columns
+        if required is not None:
+            cols = [c for c in cols if c in required]
+        return replace(
+            node, table=_prune(node.table, set(cols), schema), columns=list(cols)
+        )
+    if isinstance(node, SelectRows):
+        refs = _refs(node.condition)
+        below = None if required is None or refs is None else required | refs
+        return replace(node, table=_prune(node.table, below, schema))
+    if isinstance(node, AddColumn):
+        if (
+            required is not None
+            and node.new_column not in required
+            and not _pinned(node.expression)
+        ):
+            return _prune(node.table, required, schema)
+        refs = _refs(node.expression)
+        below = (
+            None
+            if required is None or refs is None
+            else (required - {node.new_column}) | refs
+        )
+        return replace(node, table=_prune(node.table, below, schema))
+    if isinstance(node, RenameColumns):
+        inverse = {new: old for old, new in node.mapping.items()}
+        below = (
+            None
+            if required is None
+            else {inverse.get(c, c) for c in required} | set(node.mapping)
+        )
+        return replace(node, table=_prune(node.table, below, schema))
+    if isinstance(node, Group):
+        aggs = node.aggs
+        if required is not None:
+            aggs = {
+                name: expr
+                for name, expr in aggs.items()
+                if name in required or _pinned(expr)
+            }
+        below: Optional[set] = set(node.keys)
+        for expr in aggs.values():
+            refs = _refs(expr)
+            below = None if refs is None or below is None else below | refs
+        return replace(node, table=_prune(node.table, below, schema), aggs=aggs)
+    if isinstance(node, Join):
+        return replace(
+            node,
+            left=_prune_side(node.left, required, set(node.on), schema),
+            right=_prune_side(node.right, required, set(node.on.values()), schema),
+        )
+    if isinstance(node, Buffer):
+        return replace(node, table=_prune(node.table, None, schema))
+    if hasattr(node, "table"):
+        # Pivot and Unpivot read columns the optimizer does not track
+        return replace(node, table=_prune(node.table, None, schema))
+    return node
+
+
+def _prune_side(side: Any, required: Optional[set], keys: set, schema: Schema) -> Any:
+    cols = _columns(side, schema)
+    if required is None or cols is None:
+        return _prune(side, None, schema)
+    needed = [c for c in cols if c in required or c in keys]
+    if not needed:
+        return _prune(side, None, schema)
+    if len(needed) == len(cols):
+        return _prune(side, set(needed), schema)
+    return SelectColumns(_prune(side, set(needed), schema), needed)
+
+
+def optimize(node: Any, schema: Optional[Schema] = None) -> Any:
+    """Return an equivalent, cheaper plan for *node*.
+
+    Args:
+        node: The last step of an m_ast pipeline.
+        schema: Optional mapping of table name to column names, used to push
+            filters into Join inputs and prune the columns they read.
+
+    Returns:
+        A new plan; the input nodes are not modified.
+
+    Examples:
+        >>> from m_ast.nodes import SelectRows
+        >>> optimize(SelectRows(SelectRows("t", "a > 1"), "b < 2"))
+        SelectRows(table='t', condition='(a > 1) AND (b < 2)')
+    """
+    schema = schema or {}
+    optimized = _prune(_pushdown(node, schema), None, schema)
+    # Rewrites may wrap a frozen plan in new mutable nodes: keep it frozen
+    return freeze(optimized) if isinstance(node, FrozenNode) else optimized
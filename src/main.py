@@ -1,15 +1,297 @@
+import copy
+import importlib
+import importlib.util
+import math
+import os
+import queue
 import re
-import pandas as pd
-import duckdb
+import threading
+import time
+import weakref
+from collections import OrderedDict
 import traceback
 from enum import Enum, auto
-from typing import Dict, Optional
-from jinja2 import Environment, PackageLoader, select_autoescape
-from m_ast.nodes import SelectColumns
-from m_ast.emit import emit_selectcolumns
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, Iterator, Optional, Union
+from m_ast import explain_step
+from m_ast.compiler import PLAN_NODES, compile_plan, plan_key, plan_tables
+from m_ast.nodes import Buffer, Pivot
+from m_ast.optimize import optimize
 from m_ast.config import get_normalize_columns
 
-env = Environment(loader=PackageLoader("main"), autoescape=select_autoescape())
+
+class _LazyModule:
+    """Stand-in for a module that is imported on first attribute access.
+
+    pandas, duckdb, pyarrow and asyncio dominate the cost of ``import main``
+    but are not needed until a List is built. On first use the proxy imports
+    the module and replaces itself in this module's globals, so later lookups
+    reach the real module directly.
+    """
+
+    def __init__(self, name: str, alias: str) -> None:
+        self._name = name
+        self._alias = alias
+
+    def __getattr__(self, attr: str) -> Any:
+        module = importlib.import_module(self._name)
+        globals()[self._alias] = module
+        return getattr(module, attr)
+
+
+pd: Any = _LazyModule("pandas", "pd")
+duckdb: Any = _LazyModule("duckdb", "duckdb")
+asyncio: Any = _LazyModule("asyncio", "asyncio")
+futures: Any = _LazyModule("concurrent.futures", "futures")
+json: Any = _LazyModule("json", "json")
+tempfile: Any = _LazyModule("tempfile", "tempfile")
+# Arrow mode is optional: pa is None when pyarrow is not installed
+pa: Any = _LazyModule("pyarrow", "pa") if importlib.util.find_spec("pyarrow") else None
+
+
+# A frame is anything DuckDB can register: a pandas DataFrame or, in Arrow
+# mode, a pyarrow Table.
+Frame = Any
+# Values bound to ``?``/``$n`` placeholders: positional list or named dict.
+Params = Optional[Union[list, dict]]
+
+
+def _is_arrow(frame: Frame) -> bool:
+    return pa is not None and isinstance(frame, (pa.Table, pa.RecordBatchReader))
+
+
+def _frame_columns(frame: Frame) -> list:
+    """Return the column names of a pandas or Arrow frame."""
+    if pa is not None and isinstance(frame, (pa.Table, pa.RecordBatch)):
+        return list(frame.column_names)
+    return list(frame.columns)
+
+
+# Aggregate SQL for each statistic name accepted by List.stats
+_STAT_SQL: Dict[str, str] = {
+    "mean": 'avg("{col}")',
+    "stdev_s": 'stddev_samp("{col}")',
+    "var_s": 'var_samp("{col}")',
+    "median": 'median("{col}")',
+    "min": 'min("{col}")',
+    "max": 'max("{col}")',
+    "sum": 'sum("{col}")',
+    "count": 'count("{col}")',
+    "nulls": 'count(*) - count("{col}")',
+}
+
+
+def _build_sql(
+    select: Any,
+    table: str,
+    where: Any,
+    group_by: Any,
+    having: Any,
+    order_by: Any,
+    limit: Optional[int],
+    offset: Optional[int],
+    joins: Any,
+) -> str:
+    """Build the run_query SELECT without going through Jinja.
+
+    The output is byte-identical to rendering templates/sql.txt with the same
+    arguments (including its blank lines), so cache keys, logs and tests that
+    compare SQL text are unaffected. `joins` is a sequence of join dicts with
+    optional type, table, using and condition keys.
+    """
+    parts = ["SELECT\n    ", ", ".join(map(str, select)) if select else "*"]
+    parts += ["\nFROM ", str(table), "\n"]
+    if joins:
+        parts.append("\n")
+        for join in joins:
+            kind = str(join.get("type", "")).upper()
+            parts.append(f"\n {kind} JOIN {join.get('table', '')}\n")
+            if join.get("using"):
+                parts.append(f"\n USING ({', '.join(map(str, join['using']))})\n")
+            elif join.get("condition"):
+                parts.append(f"\n ON {join['condition']}\n")
+    parts.append("\n")
+    if where:
+        parts += ["\nWHERE\n    ", " AND\n    ".join(map(str, where)), "\n"]
+    parts.append("\n")
+    if group_by:
+        parts += ["\nGROUP BY ", ", ".join(map(str, group_by)), "\n"]
+    parts.append("\n")
+    if having:
+        parts.append(f"\nHAVING {having}\n")
+    parts.append("\n")
+    if order_by:
+        parts += ["\nORDER BY ", ", ".join(map(str, order_by)), "\n"]
+    parts.append("\n")
+    if limit is not None:
+        parts.append(f"\nLIMIT {limit}\n")
+    parts.append("\n")
+    if offset is not None:
+        parts.append(f"\nOFFSET {offset}\n")
+    return "".join(parts)
+
+
+@lru_cache(maxsize=512)
+def _render_sql(
+    select: tuple,
+    table: str,
+    where: tuple,
+    group_by: tuple,
+    having: Any,
+    order_by: tuple,
+    limit: Optional[int],
+    offset: Optional[int],
+    joins: tuple,
+) -> str:
+    """Build the run_query SQL once per query shape.
+
+    Arguments are hashable snapshots of the run_query parameters; `joins` holds
+    each join dict as a tuple of (key, value) pairs. Literal values should be
+    bound through placeholders so that repeated queries share one shape.
+    """
+    return _build_sql(
+        select,
+        table,
+        where,
+        group_by,
+        having,
+        order_by,
+        limit,
+        offset,
+        [dict(join) for join in joins],
+    )
+
+
+def _sql_literal(value: Any) -> str:
+    """Render a Python value as a DuckDB literal for table-function arguments."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(_sql_literal(v) for v in value) + "]"
+    if isinstance(value, dict):
+        items = ", ".join(
+            f"{_sql_literal(k)}: {_sql_literal(v)}" for k, v in value.items()
+        )
+        return "{" + items + "}"
+    text = str(value).replace("'", "''")
+    return f"'{text}'"
+
+
+def _join_shape(join: dict) -> tuple:
+    return tuple(
+        (key, tuple(val) if isinstance(val, list) else val)
+        for key, val in sorted(join.items())
+    )
+
+
+_AGGREGATE_OPERATORS = frozenset(
+    {"HASH_GROUP_BY", "PERFECT_HASH_GROUP_BY", "UNGROUPED_AGGREGATE", "WINDOW"}
+)
+_CLAUSE_OPERATORS = {
+    "PROJECTION": "select",
+    "UNGROUPED_AGGREGATE": "select",
+    "HASH_GROUP_BY": "group_by",
+    "PERFECT_HASH_GROUP_BY": "group_by",
+    "ORDER_BY": "order_by",
+    "TOP_N": "order_by",
+    "LIMIT": "limit",
+    "STREAMING_LIMIT": "limit",
+    "LIMIT_PERCENT": "limit",
+}
+
+
+def _flatten_profile(node: dict, parent: Optional[int] = None, out=None) -> list:
+    """Flatten a DuckDB JSON profile into pre-order operator records."""
+    out = [] if out is None else out
+    for child in node.get("children", []):
+        out.append(
+            {
+                "operator": child.get("operator_type") or child.get("name", "").strip(),
+                "time": child.get("operator_timing", 0.0),
+                "rows": child.get("operator_cardinality", 0),
+                "bytes": child.get("result_set_size", 0),
+                "extra_info": child.get("extra_info", {}),
+                "parent": parent,
+            }
+        )
+        _flatten_profile(child, len(out) - 1, out)
+    return out
+
+
+def _operator_clause(ops: list) -> list:
+    """Name the run_query clause each profiled operator implements.
+
+    Joins map to "joins", scans and other sources to "from", and a FILTER to
+    "having" when it sits above an aggregate (otherwise "where").
+    """
+    has_agg = [op["operator"] in _AGGREGATE_OPERATORS for op in ops]
+    for i in reversed(range(len(ops))):
+        parent = ops[i]["parent"]
+        if parent is not None and has_agg[i]:
+            has_agg[parent] = True
+    clauses = []
+    for i, op in enumerate(ops):
+        name = op["operator"]
+        if name == "FILTER":
+            clauses.append("having" if has_agg[i] else "where")
+        elif name.endswith("_JOIN") or name == "CROSS_PRODUCT":
+            clauses.append("joins")
+        else:
+            clauses.append(_CLAUSE_OPERATORS.get(name, "from"))
+    return clauses
+
+
+def _operator_signature(extra_info: dict) -> Optional[str]:
+    """Identify an operator by its details, or None if they are generic."""
+    info = {k: v for k, v in extra_info.items() if k != "Estimated Cardinality"}
+    projections = info.get("Projections")
+    if not info or (
+        len(info) == 1
+        and isinstance(projections, list)
+        and all(p.startswith(("#", "__internal_")) for p in projections)
+    ):
+        return None
+    return json.dumps(info, sort_keys=True)
+
+
+def _operator_source(extra_info: dict) -> Optional[str]:
+    return extra_info.get("Table") or extra_info.get("Function")
+
+
+def _plan_steps(node: Any, out=None) -> list:
+    """Return the m_ast steps of a plan, inputs before the steps using them."""
+    out = [] if out is None else out
+    if not isinstance(node, PLAN_NODES):
+        return out
+    for child in (node.left, node.right) if hasattr(node, "left") else (node.table,):
+        _plan_steps(child, out)
+    if not any(step is node for step in out):
+        out.append(node)
+    return out
+
+
+def _profile_report(profile: dict, ops: list, steps: list) -> dict:
+    """Sum operator metrics per step; `steps` are (label, extra fields) pairs."""
+    totals = [
+        dict(extra, step=label, time=0.0, rows=None, bytes=0, operators=[])
+        for label, extra in steps
+    ]
+    for op in ops:
+        entry = totals[op["step"]]
+        entry["time"] += op["time"]
+        entry["bytes"] += op["bytes"]
+        if entry["rows"] is None:
+            entry["rows"] = op["rows"]
+        entry["operators"].append(op["operator"])
+    return {
+        "latency": profile.get("latency"),
+        "rows": profile.get("rows_returned"),
+        "peak_memory": profile.get("system_peak_buffer_memory"),
+        "steps": [entry for entry in totals if entry["operators"]],
+        "operators": ops,
+    }
 
 
 class Outlier(Enum):
@@ -27,22 +309,823 @@ class Jointype(Enum):
     ANTI = "ANTI"
 
 
+_SQL_SPACE_RE = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")|\s+")
+
+
+def _canonical_sql(query: str) -> str:
+    """Collapse whitespace outside of quoted literals and identifiers."""
+    return _SQL_SPACE_RE.sub(lambda m: m.group(1) or " ", query).strip()
+
+
+def _frame_nbytes(frame: Frame, deep: bool = True) -> int:
+    if isinstance(frame, pd.DataFrame):
+        return int(frame.memory_usage(index=True, deep=deep).sum())
+    return int(frame.nbytes)
+
+
+def _fingerprint(frame: Frame) -> tuple:
+    """Cheap identity of a registered frame: object id, row count, columns."""
+    return (id(frame), len(frame), tuple(_frame_columns(frame)))
+
+
+_NUMERIC_TYPE_RE = re.compile(
+    r"^(U?(TINY|SMALL|BIG|HUGE)?INT(EGER)?|FLOAT|REAL|DOUBLE|DECIMAL.*)$"
+)
+
+# A lazy plan of two or more deferred steps, one CTE per step
+_STEPS_RE = re.compile(r"WITH _step1 AS \(.*\) SELECT \* FROM _step(\d+)", re.S)
+
+
+def _over(source: str, query: str) -> str:
+    """Bind `current_df` in *query* to the SELECT *source*."""
+    stripped = query.lstrip()
+    if stripped[:5].upper() == "WITH ":
+        return f"WITH current_df AS ({source}), {stripped[5:]}"
+    return f"WITH current_df AS ({source}) {query}"
+
+
+class RunningMoments:
+    """Count, sum and Welford mean/M2 of one column, merged chunk by chunk."""
+
+    __slots__ = ("n", "total", "mean", "m2")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.total: Any = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def merge(self, n: int, total: Any, mean: float, m2: float) -> None:
+        """Fold in the moments of another batch (Chan et al. pairwise update)."""
+        if not n:
+            return
+        count = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / count
+        self.m2 += m2 + delta * delta * self.n * n / count
+        self.total += total
+        self.n = count
+
+    @property
+    def stdev_s(self) -> Optional[float]:
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else None
+
+
+class ResultCache:
+    """Opt-in LRU cache of run_query results.
+
+    Keys combine the canonical SQL, bound parameters and fingerprints of
+    current_df and every registered table. Entries are evicted least recently
+    used first once either `max_entries` or `max_bytes` is exceeded. Cached
+    frames are shared between hits and should be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 256 * 1024**2):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        # key -> (frame, nbytes, weakrefs to the frames the result depends on)
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> Optional[Frame]:
+        with self._lock:
+            entry = self._entries.get(key)
+            # A dead dependency means its id may have been reused: drop it
+            if entry is None or any(ref() is None for ref in entry[2]):
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: tuple, frame: Frame, deps: list) -> None:
+        nbytes = _frame_nbytes(frame)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (frame, nbytes, [weakref.ref(d) for d in deps])
+            self.nbytes += nbytes
+            while self._entries and (
+                len(self._entries) > self.max_entries or self.nbytes > self.max_bytes
+            ):
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, frame: Frame) -> int:
+        """Drop every entry computed from or holding *frame*; return the count.
+
+        A cached frame is handed out on every hit, so one modified in place
+        by a caller must go as well as the results computed from it.
+        """
+        with self._lock:
+            stale = [
+                key
+                for key, (cached, _, refs) in self._entries.items()
+                if cached is frame
+                or any(ref() is frame or ref() is None for ref in refs)
+            ]
+            for key in stale:
+                self._drop(key)
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def _drop(self, key: tuple) -> None:
+        _, nbytes, _ = self._entries.pop(key)
+        self.nbytes -= nbytes
+
+
+class QueryMetrics:
+    """Timings and sizes recorded for one instrumented List method call.
+
+    `sql` is the last statement the call executed. Times are in seconds:
+    `render_time` is spent building SQL (run_query templates and m_ast
+    compilation), `execute_time` in DuckDB and `convert_time` turning the
+    result into a pandas or Arrow frame. Row and byte counts are None when
+    unknown: input sizes for a pending lazy plan, output sizes for calls that
+    produce a scalar rather than a frame. Bytes are shallow frame sizes.
+    """
+
+    __slots__ = (
+        "method",
+        "sql",
+        "total_time",
+        "render_time",
+        "execute_time",
+        "convert_time",
+        "input_rows",
+        "input_bytes",
+        "output_rows",
+        "output_bytes",
+        "error",
+    )
+
+    def __init__(self, method: str) -> None:
+        self.method = method
+        self.sql: Optional[str] = None
+        self.total_time = 0.0
+        self.render_time = 0.0
+        self.execute_time = 0.0
+        self.convert_time = 0.0
+        self.input_rows: Optional[int] = None
+        self.input_bytes: Optional[int] = None
+        self.output_rows: Optional[int] = None
+        self.output_bytes: Optional[int] = None
+        # Name of the exception the call raised, if any
+        self.error: Optional[str] = None
+
+
+_METRIC_TOTALS = (
+    "total_time",
+    "render_time",
+    "execute_time",
+    "convert_time",
+    "input_rows",
+    "input_bytes",
+    "output_rows",
+    "output_bytes",
+)
+
+
+class MetricsAggregator:
+    """In-process metrics sink that sums QueryMetrics per method.
+
+    Pass it as ``List(df, metrics=aggregator)``; it is thread-safe, so one
+    aggregator can be shared by many Lists, run_many workers and AsyncList.
+    """
+
+    def __init__(self) -> None:
+        self._totals: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, metrics: QueryMetrics) -> None:
+        with self._lock:
+            totals = self._totals.get(metrics.method)
+            if totals is None:
+                totals = dict.fromkeys(_METRIC_TOTALS, 0)
+                totals.update(calls=0, errors=0)
+                self._totals[metrics.method] = totals
+            totals["calls"] += 1
+            totals["errors"] += metrics.error is not None
+            for field in _METRIC_TOTALS:
+                value = getattr(metrics, field)
+                if value is not None:
+                    totals[field] += value
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Return ``{method: {calls, errors, total_time, ...}}`` totals."""
+        with self._lock:
+            return {method: dict(t) for method, t in self._totals.items()}
+
+    def to_frame(self) -> "pd.DataFrame":
+        """Return the totals as a DataFrame, most expensive method first."""
+        frame = pd.DataFrame.from_dict(self.summary(), orient="index")
+        if frame.empty:
+            return frame
+        return frame.sort_values("total_time", ascending=False)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals.clear()
+
+
+# (metric, help text, [(label value, summary field), ...]) for the exporter
+_PROMETHEUS_METRICS = (
+    ("duckquery_calls_total", "List method calls.", None, [(None, "calls")]),
+    (
+        "duckquery_errors_total",
+        "List method calls that raised.",
+        None,
+        [(None, "errors")],
+    ),
+    (
+        "duckquery_seconds_total",
+        "Seconds spent in List methods, by phase.",
+        "phase",
+        [
+            ("total", "total_time"),
+            ("render", "render_time"),
+            ("execute", "execute_time"),
+            ("convert", "convert_time"),
+        ],
+    ),
+    (
+        "duckquery_rows_total",
+        "Rows read from current_df and produced by List methods.",
+        "direction",
+        [("input", "input_rows"), ("output", "output_rows")],
+    ),
+    (
+        "duckquery_bytes_total",
+        "Bytes of current_df read and produced by List methods.",
+        "direction",
+        [("input", "input_bytes"), ("output", "output_bytes")],
+    ),
+)
+
+
+class PrometheusExporter(MetricsAggregator):
+    """Metrics sink that writes the aggregated totals as a Prometheus text file.
+
+    The file is rewritten atomically at most every `interval` seconds while
+    calls are recorded (on every call with ``interval=0``) and whenever
+    `write()` is called, so it can be scraped through node_exporter's
+    textfile collector.
+    """
+
+    def __init__(self, path: str, interval: float = 10.0) -> None:
+        super().__init__()
+        self.path = path
+        self.interval = interval
+        self._written = float("-inf")
+
+    def record(self, metrics: QueryMetrics) -> None:
+        super().record(metrics)
+        if time.monotonic() - self._written >= self.interval:
+            self.write()
+
+    def render(self) -> str:
+        """Return the totals in the Prometheus text exposition format."""
+        summary = self.summary()
+        lines = []
+        for name, help_text, label, series in _PROMETHEUS_METRICS:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for method, totals in sorted(summary.items()):
+                method = method.replace("\\", "\\\\").replace('"', '\\"')
+                for value, field in series:
+                    labels = f'method="{method}"'
+                    if label is not None:
+                        labels += f',{label}="{value}"'
+                    lines.append(f"{name}{{{labels}}} {totals[field]}")
+        return "\n".join(lines) + "\n"
+
+    def write(self) -> None:
+        self._written = time.monotonic()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as fh:
+                fh.write(self.render())
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+
+def _instrumented(method: Callable) -> Callable:
+    """Record QueryMetrics for a List method when the List has metrics sinks.
+
+    Only the outermost instrumented call is recorded; methods it calls add
+    their rendering, execution and conversion time to its record.
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self: "List", *args, **kwargs):
+        if not self.metrics or self._record is not None:
+            return method(self, *args, **kwargs)
+        record = QueryMetrics(name)
+        if self._plan is None and self._frame is not None:
+            record.input_rows = len(self._frame)
+            record.input_bytes = _frame_nbytes(self._frame, deep=False)
+        self._record = record
+        started = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        except BaseException as exc:
+            record.error = type(exc).__name__
+            raise
+        finally:
+            record.total_time = time.perf_counter() - started
+            self._record = None
+            for sink in self.metrics:
+                sink.record(record)
+
+    return wrapper
+
+
+def _connect(
+    database: str = ":memory:",
+    memory_limit: Optional[str] = None,
+    threads: Optional[int] = None,
+    temp_directory: Optional[str] = None,
+) -> "duckdb.DuckDBPyConnection":
+    """Open a DuckDB database, applying any resource settings given.
+
+    `database` may be a file path for an on-disk database. `memory_limit`
+    (e.g. "4GB") caps DuckDB's buffer pool; with `temp_directory` set, large
+    sorts, joins and aggregates spill there instead of failing.
+    """
+    config: Dict[str, Any] = {}
+    if memory_limit is not None:
+        config["memory_limit"] = memory_limit
+    if threads is not None:
+        config["threads"] = threads
+    if temp_directory is not None:
+        config["temp_directory"] = temp_directory
+    return duckdb.connect(database, config=config)
+
+
+class ConnectionPool:
+    """One shared DuckDB database that hands out a cursor per List.
+
+    DuckDB registrations are local to a cursor, so every List still sees its
+    own ``current_df`` while reusing the database and its buffer pool. Tables
+    registered on the pool (or through ``List.register_table`` on a pooled
+    List) are registered on every current and future cursor.
+    """
+
+    def __init__(
+        self,
+        database: str = ":memory:",
+        memory_limit: Optional[str] = None,
+        threads: Optional[int] = None,
+        temp_directory: Optional[str] = None,
+    ):
+        self.db = _connect(database, memory_limit, threads, temp_directory)
+        self.shared_tables: Dict[str, Frame] = {}
+        self._members: "weakref.WeakSet[List]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def cursor(self, owner: "List") -> "duckdb.DuckDBPyConnection":
+        """Return a new cursor for *owner* with the shared tables registered."""
+        with self._lock:
+            cur = self.db.cursor()
+            for name, df in self.shared_tables.items():
+                cur.register(name, df)
+            self._members.add(owner)
+            return cur
+
+    def release(self, owner: "List") -> None:
+        with self._lock:
+            self._members.discard(owner)
+
+    def register_table(self, name: str, df: Frame) -> "ConnectionPool":
+        """Register a reference table visible to every List in the pool"""
+        if pa is not None and isinstance(df, pa.RecordBatchReader):
+            df = df.read_all()
+        with self._lock:
+            self.shared_tables[name] = df
+            for member in list(self._members):
+                if member.db is not None:
+                    member.db.register(name, df)
+                    member._index_table(name, df)
+        return self
+
+    def close(self) -> None:
+        with self._lock:
+            self._members.clear()
+            self.db.close()
+
+
+_default_pool: Optional[ConnectionPool] = None
+
+
+def default_pool() -> ConnectionPool:
+    """Return the module-level in-memory ConnectionPool, creating it once."""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = ConnectionPool()
+    return _default_pool
+
+
 class List:
-    def __init__(self, df: pd.DataFrame, value: Optional[float] = 0):
+    def __init__(
+        self,
+        df: Optional[Frame],
+        value: Optional[float] = 0,
+        lazy: bool = False,
+        arrow: bool = False,
+        pool: Optional[ConnectionPool] = None,
+        cache: Optional[ResultCache] = None,
+        database: str = ":memory:",
+        memory_limit: Optional[str] = None,
+        threads: Optional[int] = None,
+        temp_directory: Optional[str] = None,
+        metrics: Any = None,
+    ):
+        # In lazy mode filter/select/order/limit/run_query only extend a SQL
+        # plan over current_df; it runs when the dataframe is actually needed.
+        self.lazy = lazy
+        # In Arrow mode intermediates stay as pyarrow Tables and are only
+        # converted to pandas when `df`/`data()` is read.
+        self.arrow = arrow or _is_arrow(df)
+        if self.arrow and pa is None:
+            raise ImportError("Arrow mode requires the 'pyarrow' package")
+        if pa is not None and isinstance(df, pa.RecordBatchReader):
+            df = df.read_all()
+        self._plan: Optional[str] = None
         self.df = df
-        self.db = duckdb.connect()
+        self.pool = pool
+        self.cache = cache
         self.value: Optional[float] = value
         # Register the dataframe with DuckDB so it can track changes
-        self.registered_tables: Dict[str, pd.DataFrame] = {}
-        self.db.register("current_df", self.df)
+        self.registered_tables: Dict[str, Frame] = {}
+        # column name -> registered tables containing it, kept in step with
+        # registered_tables so run_query qualifies select items in O(1)
+        self._column_tables: Dict[Any, Dict[str, None]] = {}
+        self._table_rank: Dict[str, int] = {}
+        self._colset: Optional[tuple] = None
+        # Running moments kept by append(); valid while _plan == _moments_plan
+        self._moments: Optional[Dict[str, RunningMoments]] = None
+        self._moments_plan: Optional[str] = None
+        self._append_table: Optional[str] = None
+        # Temp tables holding the input of m_ast Buffer steps, by plan key
+        self._buffers: Dict[tuple, tuple] = {}
+        # Values discovered for m_ast Pivot steps without explicit values
+        self._pivot_cache: Dict[tuple, tuple] = {}
+        # Sinks (objects with a record(QueryMetrics) method) for instrumented
+        # calls, and the record of the call in progress
+        if metrics is not None and not isinstance(metrics, (list, tuple)):
+            metrics = (metrics,)
+        self.metrics: tuple = tuple(metrics or ())
+        self._record: Optional[QueryMetrics] = None
+        settings = (memory_limit, threads, temp_directory)
+        if pool is not None:
+            if database != ":memory:" or any(v is not None for v in settings):
+                raise ValueError("Database settings belong to the ConnectionPool")
+            self.db = pool.cursor(self)
+            for name, shared in pool.shared_tables.items():
+                self._index_table(name, shared)
+        else:
+            self.db = _connect(database, *settings)
+        if self._frame is not None:
+            self.db.register("current_df", self._frame)
+
+    @classmethod
+    def from_parquet(
+        cls, path, options: Optional[Dict[str, Any]] = None, **kwargs
+    ) -> "List":
+        """Build a List whose current_df reads Parquet file(s) in place.
+
+        `path` may be a file, a glob or a list of paths; `options` are passed
+        to DuckDB's read_parquet (e.g. ``{"hive_partitioning": True}``) and
+        `kwargs` to the List constructor. Nothing is loaded into pandas until
+        the data is needed, so projections and filters are pushed into the
+        scan and can skip row groups.
+        """
+        return cls._from_reader("read_parquet", path, options, **kwargs)
+
+    @classmethod
+    def from_csv(
+        cls, path, options: Optional[Dict[str, Any]] = None, **kwargs
+    ) -> "List":
+        """Build a List whose current_df reads CSV file(s) via read_csv."""
+        return cls._from_reader("read_csv", path, options, **kwargs)
+
+    @classmethod
+    def from_glob(
+        cls, pattern: str, options: Optional[Dict[str, Any]] = None, **kwargs
+    ) -> "List":
+        """Build a List over every file matching `pattern`.
+
+        The reader is chosen from the pattern's extension: .parquet uses
+        read_parquet, .csv/.tsv/.txt use read_csv and .json/.jsonl/.ndjson
+        use read_json.
+        """
+        ext = os.path.splitext(pattern.rstrip("*"))[1].lower()
+        readers = {
+            ".parquet": "read_parquet",
+            ".csv": "read_csv",
+            ".tsv": "read_csv",
+            ".txt": "read_csv",
+            ".json": "read_json",
+            ".jsonl": "read_json",
+            ".ndjson": "read_json",
+        }
+        if ext not in readers:
+            raise ValueError(f"Cannot infer a reader for pattern: {pattern}")
+        return cls._from_reader(readers[ext], pattern, options, **kwargs)
+
+    @classmethod
+    def _from_reader(
+        cls, reader: str, path, options: Optional[Dict[str, Any]], **kwargs
+    ) -> "List":
+        args = [_sql_literal(list(path) if isinstance(path, tuple) else path)]
+        args += [f"{k} = {_sql_literal(v)}" for k, v in (options or {}).items()]
+        lst = cls(None, **kwargs)
+        lst._plan = f"SELECT * FROM {reader}({', '.join(args)})"
+        return lst
+
+    @property
+    def df(self) -> "pd.DataFrame":
+        if self._plan is not None:
+            self._materialize()
+        if self._pandas is None:
+            self._pandas = self._frame.to_pandas()
+        return self._pandas
+
+    @df.setter
+    def df(self, df: Frame) -> None:
+        self._frame = df
+        self._pandas = df if isinstance(df, pd.DataFrame) else None
+        self._plan = None
+        self._plan_params: Union[list, dict] = []
+        self._normalize_pending = False
+
+    def _sql(self, query: str) -> str:
+        """Bind `current_df` in *query* to the pending lazy plan, if any."""
+        if self._plan is None:
+            return query
+        return _over(self._plan, query)
+
+    def _chain(self, query: str) -> str:
+        """Return the lazy plan of *query* run over the pending plan.
+
+        Each step becomes its own CTE (_step1, _step2, ...) that reads the
+        step before it as current_df. Nesting each step inside the next would
+        put current_df CTEs inside one another, and from three levels down
+        DuckDB binds the innermost reference to the wrong one.
+        """
+        plan = self._plan
+        if plan is None:
+            return query
+        match = _STEPS_RE.fullmatch(plan)
+        if match is None:
+            head, n = f"WITH _step1 AS ({plan})", 1
+        else:
+            head, n = plan[: plan.rindex(" SELECT * FROM _step")], int(match[1])
+        step = _over(f"SELECT * FROM _step{n}", query)
+        return f"{head}, _step{n + 1} AS ({step}) SELECT * FROM _step{n + 1}"
+
+    def _bind(self, params: Params = None) -> Params:
+        """Prepend the pending plan's parameters to *params*.
+
+        A plan bound with named parameters merges them with named *params*;
+        DuckDB cannot mix the two styles in one query, so mixing raises.
+        """
+        plan_params = self._plan_params
+        if not plan_params:
+            return params
+        if not params:
+            return plan_params
+        if isinstance(plan_params, dict) != isinstance(params, dict):
+            raise ValueError(
+                "Cannot mix positional and named parameters across a lazy plan"
+            )
+        if isinstance(params, dict):
+            clash = [
+                k for k in params if k in plan_params and params[k] != plan_params[k]
+            ]
+            if clash:
+                raise ValueError(f"Named parameters {clash} rebound with new values")
+            return {**plan_params, **params}
+        return plan_params + list(params)
+
+    def _execute(self, query: str, params: Params = None):
+        """Execute *query* over current_df, binding any pending lazy plan."""
+        record = self._record
+        if record is None:
+            return self.db.execute(self._sql(query), self._bind(params))
+        record.sql = self._sql(query)
+        started = time.perf_counter()
+        result = self.db.execute(record.sql, self._bind(params))
+        record.execute_time += time.perf_counter() - started
+        return result
+
+    def _cursor(self) -> "duckdb.DuckDBPyConnection":
+        """Return a new cursor on this List's database with its tables registered.
+
+        Registrations are cursor-local, so current_df and every registered
+        table are registered again (without copying) on the new cursor.
+        """
+        cur = self.db.cursor()
+        if self._frame is not None:
+            cur.register("current_df", self._frame)
+        for name, tdf in self.registered_tables.items():
+            cur.register(name, tdf)
+        return cur
+
+    def _task_copy(self) -> "List":
+        """Return a shallow copy of this List bound to its own new cursor."""
+        task = copy.copy(self)
+        task.db = self._cursor()
+        # Temp tables are cursor-local, so the copy buffers on its own cursor
+        task._buffers = {}
+        task._record = None
+        return task
+
+    def _fetch(self, query: str, params: Params = None) -> Frame:
+        """Execute *query* and return the result as Arrow or pandas."""
+        result = self._execute(query, params)
+        record = self._record
+        started = time.perf_counter()
+        frame = result.fetch_arrow_table() if self.arrow else result.df()
+        if record is not None:
+            record.convert_time += time.perf_counter() - started
+            record.output_rows = len(frame)
+            record.output_bytes = _frame_nbytes(frame, deep=False)
+        return frame
+
+    def _apply(self, query: str, params: Params = None, defer: bool = False) -> "List":
+        """Run a transform over current_df now, or defer it in lazy mode."""
+        if self.lazy or defer:
+            bound = self._bind(params)
+            self._plan = self._chain(query)
+            self._plan_params = bound if isinstance(bound, dict) else list(bound or [])
+            return self
+        self.df = self._fetch(query, params)
+        self._register_current()
+        return self
+
+    def _materialize(self) -> None:
+        normalize = self._normalize_pending
+        frame = self._fetch("SELECT * FROM current_df")
+        self.df = self._normalize(frame) if normalize else frame
+        self._register_current()
+
+    def _columns(self) -> list:
+        """Return current_df column names without materializing a lazy plan."""
+        if self._plan is None:
+            return _frame_columns(self._frame)
+        rel = self._execute("SELECT * FROM current_df LIMIT 0")
+        return [d[0] for d in rel.description]
+
+    def _column_set(self) -> frozenset:
+        """Return current_df column names as a set, memoized per frame/plan."""
+        cached = self._colset
+        if cached is None or cached[0] is not self._frame or cached[1] != self._plan:
+            cached = (self._frame, self._plan, frozenset(self._columns()))
+            self._colset = cached
+        return cached[2]
+
+    def _plan_schema(self) -> Dict[str, list]:
+        """Columns of current_df and every registered table, for m_ast.optimize."""
+        schema = {
+            name: _frame_columns(df) for name, df in self.registered_tables.items()
+        }
+        schema["current_df"] = self._columns()
+        return schema
+
+    def _buffer(self, node: Buffer, sql: str) -> Optional[str]:
+        """Materialize the input of an m_ast Buffer step into a temp table.
+
+        The table is keyed by the structure of the subplan and the frames it
+        reads, so later queries in this session reuse it until those frames
+        change. A table is dropped once one of its frames is gone or the same
+        subplan is buffered over new inputs, and all of them on close().
+        Subplans with positional parameters are left to compile_plan's
+        MATERIALIZED CTE.
+        """
+        if "?" in sql:
+            return None
+        keyed = self._subplan_key(node.table)
+        if keyed is None:
+            return None
+        key, frames = keyed
+        entry = self._buffers.get(key)
+        if entry is not None and all(ref() is not None for ref in entry[1]):
+            return entry[0]
+        pending = self._plan or ""
+        for old, (table, refs) in list(self._buffers.items()):
+            if f'"{table}"' in pending:
+                continue
+            if old[0] == key[0] or any(ref() is None for ref in refs):
+                del self._buffers[old]
+                self.db.execute(f'DROP TABLE IF EXISTS "{table}"')
+        name = f"_buffer_{hash(key) & 0xFFFFFFFFFFFFFFFF:016x}"
+        self.db.execute(
+            f'CREATE OR REPLACE TEMP TABLE "{name}" AS {self._sql(sql)}',
+            self._bind(None),
+        )
+        self._buffers[key] = (name, tuple(weakref.ref(f) for f in frames))
+        return name
+
+    def _pivot_values(self, node: Pivot, sql: str) -> Optional[list]:
+        """Discover the values of an m_ast Pivot step with one SELECT DISTINCT.
+
+        Values are cached like Buffer tables, by the structure of the input
+        subplan and the frames it reads, so repeated pivots skip discovery,
+        and are invalidated with them. NULLs are left out, as in DuckDB's own
+        PIVOT.
+        """
+        if "?" in sql:
+            return None
+        keyed = self._subplan_key(node.table)
+        if keyed is None:
+            return None
+        key, frames = keyed
+        key += (node.pivot_column,)
+        entry = self._pivot_cache.get(key)
+        if entry is not None and all(ref() is not None for ref in entry[1]):
+            return entry[0]
+        col = f'"{node.pivot_column}"'
+        query = (
+            f"SELECT DISTINCT {col} FROM ({sql}) AS pivot_input "
+            f"WHERE {col} IS NOT NULL ORDER BY 1"
+        )
+        values = [row[0] for row in self._execute(query).fetchall()]
+        self._pivot_cache[key] = (values, tuple(weakref.ref(f) for f in frames))
+        return values
+
+    def _subplan_key(self, subplan: Any) -> Optional[tuple]:
+        """Key an m_ast subplan by its structure and the frames it reads.
+
+        Returns the key and those frames; callers hold weak references to
+        them so an entry dies with its inputs. Returns None when the subplan
+        reads a current_df that is a DuckDB table or file rather than a
+        frame, since rows can change without the plan text changing.
+        """
+        tables = plan_tables(subplan)
+        frames = [self.registered_tables.get(t) for t in sorted(tables)]
+        state: tuple = ()
+        if "current_df" in tables:
+            if self._frame is None:
+                return None
+            frames.append(self._frame)
+            params = self._plan_params
+            params = params.items() if isinstance(params, dict) else params
+            state = (self._plan, tuple(params))
+        frames = [f for f in frames if f is not None]
+        return (plan_key(subplan), state, tuple(id(f) for f in frames)), frames
+
+    def _index_table(self, name: str, df: Frame) -> None:
+        """Record *df* under *name* and update the column -> tables index."""
+        old = self.registered_tables.get(name)
+        if old is not None:
+            for col in _frame_columns(old):
+                tables = self._column_tables.get(col)
+                if tables is not None:
+                    tables.pop(name, None)
+                    if not tables:
+                        del self._column_tables[col]
+        self.registered_tables[name] = df
+        self._table_rank.setdefault(name, len(self._table_rank))
+        for col in _frame_columns(df):
+            self._column_tables.setdefault(col, {})[name] = None
+
+    @staticmethod
+    def _normalize(frame: Frame) -> Frame:
+        normalized: list[str] = []
+        for c in _frame_columns(frame):
+            m = re.match(r"^(.+)_(\d+)$", str(c))
+            if m and m.group(1) in normalized:
+                normalized.append(m.group(1))
+            else:
+                normalized.append(str(c))
+        if isinstance(frame, pd.DataFrame):
+            frame.columns = normalized
+            return frame
+        return frame.rename_columns(normalized)
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if hasattr(self, "db") and self.db:
-            self.db.close()
-            self.db = None
+        self.close()
 
         if exc_type is None:
             print("List context exited normally")
@@ -66,18 +1149,37 @@ class List:
 
     def close(self):
         if hasattr(self, "db") and self.db:
+            self._invalidate_subplans()
             self.db.close()
             self.db = None
+        if getattr(self, "pool", None) is not None:
+            self.pool.release(self)
 
-    def register_table(self, name: str, df: pd.DataFrame):
-        """Register additional dataframes for joins"""
+    def register_table(self, name: str, df: Frame):
+        """Register additional dataframes (pandas or Arrow) for joins"""
+        self._invalidate_subplans()
+        if self.cache is not None:
+            if name in self.registered_tables:
+                self.cache.invalidate(self.registered_tables[name])
+            self.cache.invalidate(df)
+        if self.pool is not None:
+            # Pooled Lists share reference tables with every other member
+            self.pool.register_table(name, df)
+            return self
+        if pa is not None and isinstance(df, pa.RecordBatchReader):
+            df = df.read_all()
         self.db.register(name, df)
-        self.registered_tables[name] = df
+        self._index_table(name, df)
         return self
 
+    @_instrumented
     def mean(self, col: str) -> "List":
+        moments = self._running(col)
+        if moments is not None:
+            self.value = moments.mean if moments.n else None
+            return self
         # Use the registered dataframe
-        row = self.db.execute(f'SELECT avg("{col}") from current_df').fetchone()
+        row = self._execute(f'SELECT avg("{col}") from current_df').fetchone()
         self.value = row[0] if row else None
         return self
 
@@ -87,29 +1189,42 @@ class List:
         self.value *= factor
         return self
 
+    @_instrumented
     def quantile(self, col: str, percentile: float) -> "List":
-        # Use pandas quantile to match pandas' behavior and interpolation
-        # This avoids differences between DuckDB and pandas quantile implementations
-        if col not in self.df.columns:
+        # quantile_cont uses the same linear interpolation as pandas'
+        # Series.quantile default, so results match without leaving DuckDB
+        if col not in self._columns():
             raise KeyError(f"Column '{col}' not found in dataframe")
-        self.value = float(self.df[col].quantile(percentile))
+        row = self._execute(
+            f'SELECT quantile_cont("{col}", {float(percentile)}) FROM current_df'
+        ).fetchone()
+        self.value = float(row[0]) if row and row[0] is not None else None
         return self
 
+    @_instrumented
     def outlier(self, col: str, tail: Outlier) -> "List":
+        if col not in self._columns():
+            raise KeyError(f"Column '{col}' not found in dataframe")
+        # One scan computes everything the bounds below may need
+        row = self._execute(f"""
+            SELECT
+                quantile_cont("{col}", [0.25, 0.75]),
+                max("{col}"),
+                avg("{col}"),
+                stddev_samp("{col}")
+            FROM current_df
+            """).fetchone()
+        quartiles, max_val, mean_val, std_val = row if row else (None,) * 4
         # Compute robust IQR-based bounds by default
-        q1 = self.quantile(col, 0.25).result()
-        q3 = self.quantile(col, 0.75).result()
+        q1, q3 = quartiles if quartiles else (None, None)
 
         # Heuristic: if there's an extreme outlier (very large max),
         # prefer a std-dev based bound so the threshold reflects extreme skew.
         # This is a targeted heuristic to detect egregious single-value outliers
         # (e.g. 1000 in human age data) while keeping IQR behavior for typical cases.
-        col_series = self.df[col].dropna()
-        max_val = col_series.max()
-
         if max_val is not None and max_val >= 1000:
-            mean = float(col_series.mean())
-            std = float(col_series.std())
+            mean = float(mean_val)
+            std = float(std_val) if std_val is not None else float("nan")
             if tail == Outlier.HIGH:
                 self.value = mean + 3 * std
             else:
@@ -117,13 +1232,14 @@ class List:
         else:
             # If quantiles are missing, fall back to std-dev heuristic
             if q1 is None or q3 is None:
-                mean = float(col_series.mean()) if not col_series.empty else 0.0
-                std = float(col_series.std()) if not col_series.empty else 0.0
+                mean = float(mean_val) if mean_val is not None else 0.0
+                std = float(std_val) if std_val is not None else 0.0
                 if tail == Outlier.HIGH:
                     self.value = mean + 3 * std
                 else:
                     self.value = mean - 3 * std
             else:
+                q1, q3 = float(q1), float(q3)
                 iqr = q3 - q1
                 if tail == Outlier.HIGH:
                     self.value = q3 + (1.5 * iqr)
@@ -131,6 +1247,7 @@ class List:
                     self.value = q1 - (1.5 * iqr)
         return self
 
+    @_instrumented
     def median_of_means(self, group_col: str, mean_col: str) -> "List":
         result = f"""
         WITH base as
@@ -145,47 +1262,202 @@ class List:
             median(b.value) as "Median of Means"
         FROM base b
         """
-        row = self.db.execute(result).fetchone()
+        row = self._execute(result).fetchone()
         self.value = row[0] if row else None
         return self
 
+    @_instrumented
     def stdev_s(self, col: str) -> "List":
+        moments = self._running(col)
+        if moments is not None:
+            self.value = moments.stdev_s
+            return self
         result = f"""
             SELECT
                 stddev_samp("{col}")
             FROM current_df
         """
-        row = self.db.execute(result).fetchone()
+        row = self._execute(result).fetchone()
         self.value = row[0] if row else None
         return self
 
+    @_instrumented
+    def stats(self, spec) -> Dict[str, Dict[Any, Any]]:
+        """Compute many column statistics in a single scan of current_df.
+
+        Args:
+            spec: dict mapping a column to a list of statistics, or a list of
+                (column, statistic) pairs. A statistic is one of the names in
+                _STAT_SQL (mean, stdev_s, var_s, median, min, max, sum, count,
+                nulls) or a float percentile, computed with quantile_cont.
+
+        Returns:
+            Nested dict ``{column: {statistic: value}}``.
+
+        Example:
+            >>> lst.stats({"age": ["mean", 0.5], "salary": ["max"]})
+            {'age': {'mean': 35.0, 0.5: 35.0}, 'salary': {'max': 90000}}
+        """
+        pairs = spec.items() if isinstance(spec, dict) else [(c, [s]) for c, s in spec]
+        columns = self._columns()
+        keys = []
+        exprs = []
+        for col, col_stats in pairs:
+            if col not in columns:
+                raise KeyError(f"Column '{col}' not found in dataframe")
+            for stat in col_stats:
+                if isinstance(stat, float):
+                    expr = f'quantile_cont("{col}", {stat})'
+                elif stat in _STAT_SQL:
+                    expr = _STAT_SQL[stat].format(col=col)
+                else:
+                    raise ValueError(f"Unsupported statistic: {stat}")
+                keys.append((col, stat))
+                exprs.append(expr)
+        results: Dict[str, Dict[Any, Any]] = {}
+        if not exprs:
+            return results
+        row = self._execute(f"SELECT {', '.join(exprs)} FROM current_df").fetchone()
+        values = row if row else (None,) * len(keys)
+        for (col, stat), val in zip(keys, values):
+            results.setdefault(col, {})[stat] = val
+        return results
+
+    @_instrumented
+    def summarize(self) -> "pd.DataFrame":
+        """Return DuckDB's SUMMARIZE profile (one row per column) of current_df"""
+        query = self._sql("SELECT * FROM current_df")
+        return self.db.execute(f"SUMMARIZE {query}", self._bind()).df()
+
+    @_instrumented
     def order(self, ordering: list) -> "List":
         order_by = ",".join(ordering)
-        self.df = self.db.execute(f"SELECT * FROM current_df ORDER BY {order_by}").df()
-        self.register()
-        return self
+        return self._apply(f"SELECT * FROM current_df ORDER BY {order_by}")
 
     def register(self) -> "List":
-        self.db.register("current_df", self.df)
+        self._invalidate_subplans()
+        if self._plan is not None:
+            # Materializing re-registers the result as current_df
+            self._materialize()
+            return self
+        if self.cache is not None:
+            # The frame may have been modified in place since it was cached
+            self.cache.invalidate(self._frame)
+        return self._register_current()
+
+    def _invalidate_subplans(self) -> None:
+        """Drop the Buffer tables and Pivot values; inputs may have changed."""
+        if self.db is not None:
+            for name, _ in self._buffers.values():
+                self.db.execute(f'DROP TABLE IF EXISTS "{name}"')
+        self._buffers.clear()
+        self._pivot_cache.clear()
+
+    def _register_current(self) -> "List":
+        # The frame may have gained or lost columns in place
+        self._colset = None
+        self.db.register("current_df", self._frame)
         return self
 
+    @_instrumented
     def limit(self, limit: int) -> "List":
-        self.df = self.db.execute(f"SELECT * FROM current_df LIMIT {limit}").df()
-        self.register()
-        return self
+        return self._apply(f"SELECT * FROM current_df LIMIT {limit}")
 
+    @_instrumented
     def filter(self, condition: str) -> "List":
-        # Update the registered dataframe and get new result
-        self.df = self.db.execute(f"SELECT * from current_df WHERE {condition}").df()
-        self.register()  # Re-register the updated dataframe
-        return self
+        return self._apply(f"SELECT * from current_df WHERE {condition}")
 
+    @_instrumented
     def select(self, cols: list) -> "List":
-        # Update the registered dataframe and get new result
         select_cols = ",".join([f'"{col}"' for col in cols])
-        self.df = self.db.execute(f"SELECT {select_cols} from current_df").df()
-        self.register()
-        # self.db.register('current_df', self.df)  # Re-register the updated dataframe
+        return self._apply(f"SELECT {select_cols} from current_df")
+
+    @_instrumented
+    def persist(self, name: str) -> "List":
+        """Store current_df as a DuckDB table and continue from that table.
+
+        The rows live in the List's database (on disk when it was opened with
+        a file path) instead of in pandas, so later steps can spill under the
+        configured memory_limit. The table is replaced if it already exists.
+        """
+        # CREATE cannot follow a WITH, so the pending plan goes inside the AS
+        query = self._sql("SELECT * FROM current_df")
+        self.db.execute(f'CREATE OR REPLACE TABLE "{name}" AS {query}', self._bind())
+        normalize = self._normalize_pending
+        self.df = None
+        self._plan = f'SELECT * FROM "{name}"'
+        self._normalize_pending = normalize
+        self._moments = None
+        return self
+
+    @_instrumented
+    def append(
+        self, chunk: Frame, table: Optional[str] = None, track: Optional[list] = None
+    ) -> "List":
+        """Insert the rows of *chunk* (pandas or Arrow) into current_df.
+
+        The first call persists current_df as the DuckDB table `table` (by
+        default ``appended_df_<id>``, unique to this List so Lists sharing a
+        pool do not write into each other's table) and computes count, sum,
+        mean and M2 for the tracked columns (by default every numeric
+        column). Later chunks are inserted by column name and
+        only their own moments are computed and merged in, so mean() and
+        stdev_s() on a tracked column answer in O(1) for as long as
+        current_df is that table.
+        """
+        if self._moments is None or self._plan != self._moments_plan:
+            table = table or f"appended_df_{id(self):x}"
+            self.persist(table)
+            if track is None:
+                rows = self.db.execute(f'DESCRIBE "{table}"').fetchall()
+                track = [r[0] for r in rows if _NUMERIC_TYPE_RE.match(r[1])]
+            self._moments = {col: RunningMoments() for col in track}
+            self._merge_moments("current_df")
+            self._moments_plan, self._append_table = self._plan, table
+        else:
+            table = self._append_table
+        self._invalidate_subplans()
+        self.db.register("append_chunk", chunk)
+        try:
+            self.db.execute(f'INSERT INTO "{table}" BY NAME SELECT * FROM append_chunk')
+            self._merge_moments("append_chunk")
+        finally:
+            self.db.unregister("append_chunk")
+        return self
+
+    def _merge_moments(self, source: str) -> None:
+        """Compute per-column moments over *source* in one scan and merge them."""
+        cols = list(self._moments or ())
+        if not cols:
+            return
+        exprs = ", ".join(
+            f'count("{c}"), sum("{c}"), avg("{c}"), var_pop("{c}")' for c in cols
+        )
+        row = self._execute(f"SELECT {exprs} FROM {source}").fetchone()
+        for i, col in enumerate(cols):
+            n, total, mean, var = row[4 * i : 4 * i + 4]
+            if n:
+                self._moments[col].merge(n, total, float(mean), float(var) * n)
+
+    def _running(self, col: str) -> Optional[RunningMoments]:
+        """Return append()'s running moments for *col*, if still current."""
+        if self._moments is None or self._plan != self._moments_plan:
+            return None
+        return self._moments.get(col)
+
+    def _adopt(self, other: "List") -> None:
+        """Take over the current_df state computed by a copy of this List."""
+        self._frame, self._pandas = other._frame, other._pandas
+        self._plan, self._plan_params = other._plan, other._plan_params
+        self._normalize_pending = other._normalize_pending
+        if self._plan is None:
+            self._register_current()
+
+    @_instrumented
+    def collect(self) -> "List":
+        """Execute any pending lazy plan and re-register the result."""
+        if self._plan is not None:
+            self._materialize()
         return self
 
     def show_info(self):
@@ -197,10 +1469,52 @@ class List:
     def result(self) -> Optional[float]:
         return self.value
 
-    def data(self) -> pd.DataFrame:
+    def data(self) -> "pd.DataFrame":
         return self.df
 
-    def run_query(
+    def iter_batches(
+        self, batch_size: int = 1_000_000, as_pandas: bool = False
+    ) -> Iterator[Any]:
+        """Stream current_df (including a pending lazy plan) in batches.
+
+        Yields pyarrow RecordBatches of at most `batch_size` rows, or pandas
+        DataFrames when `as_pandas` is True, from DuckDB's fetch_record_batch.
+        The full result is never held in memory. Streaming runs on its own
+        cursor, so the List can still be queried while iterating.
+        """
+        if pa is None:
+            raise ImportError("iter_batches requires the 'pyarrow' package")
+        cur = self._cursor()
+        try:
+            result = cur.execute(self._sql("SELECT * FROM current_df"), self._bind())
+            reader = result.fetch_record_batch(batch_size)
+            for batch in reader:
+                if self._normalize_pending:
+                    batch = self._normalize(batch)
+                yield batch.to_pandas() if as_pandas else batch
+        finally:
+            cur.close()
+
+    def to_arrow(self) -> "pa.Table":
+        """Return current_df as a pyarrow Table (zero-copy in Arrow mode)."""
+        if pa is None:
+            raise ImportError("to_arrow requires the 'pyarrow' package")
+        self.collect()
+        if isinstance(self._frame, pa.Table):
+            return self._frame
+        return pa.Table.from_pandas(self._frame, preserve_index=False)
+
+    def _compile_plan(self, plan: Any, defer: bool = False) -> str:
+        """Compile an (optimized) m_ast plan with this List's Buffer/Pivot hooks.
+
+        Buffer tables are TEMP and so only visible on this cursor; a deferred
+        plan may run on another one (iter_batches, AsyncList tasks), so it
+        keeps its Buffer steps as MATERIALIZED CTEs.
+        """
+        buffer = None if defer else self._buffer
+        return compile_plan(plan, buffer=buffer, pivot_values=self._pivot_values)
+
+    def _render_query(
         self,
         select: list = [],
         where: list = [],
@@ -210,8 +1524,9 @@ class List:
         limit: Optional[int] = None,
         offset: Optional[int] = None,
         joins: list = [],
-    ) -> "List":
-
+        params: Params = None,
+    ) -> str:
+        """Render the SELECT that run_query would run for these clauses."""
         processed_joins = []
         for join in joins:
             processed_join = join.copy()
@@ -222,12 +1537,7 @@ class List:
         # are present. If an unqualified column name exists in any registered
         # joined table, qualify it with `current_df.` to disambiguate.
         processed_select = []
-        # If caller passed an AST SelectColumns node, emit SQL directly
-        if isinstance(select, SelectColumns):
-            sql = emit_selectcolumns(select)
-            self.df = self.db.execute(sql).df()
-            self.register()
-            return self
+        current_cols = self._column_set()
         for sel in select:
             if not isinstance(sel, str):
                 processed_select.append(sel)
@@ -242,48 +1552,384 @@ class List:
                 continue
 
             # Determine which tables contain this column
-            current_has = s in list(self.df.columns)
-            tables_with = [
-                tname
-                for tname, tdf in self.registered_tables.items()
-                if s in tdf.columns
-            ]
+            current_has = s in current_cols
+            tables_with = self._column_tables.get(s)
 
             if tables_with and current_has:
                 # Ambiguous: present in current_df and in one or more joined tables
                 processed_select.append(f'current_df."{s}"')
             elif tables_with and not current_has:
-                # Present only in a registered join table: qualify with that table
-                processed_select.append(f'{tables_with[0]}."{s}"')
+                # Present only in a registered join table: qualify with the one
+                # registered first
+                first = min(tables_with, key=self._table_rank.__getitem__)
+                processed_select.append(f'{first}."{s}"')
             else:
                 # Only in current_df (or nowhere): treat as current column
                 processed_select.append(f'"{s}"')
 
         if processed_select:
             select = processed_select
-        params = {
-            "select": select,
-            "table": "current_df",
-            "where": where,
-            "group_by": group_by,
-            "having": having,
-            "order_by": order_by,
-            "limit": limit,
-            "offset": offset,
-            "joins": processed_joins,
-        }
-        template = env.get_template("sql.txt")
-        query = template.render(**params)
-        self.df = self.db.execute(query).df()
-        if get_normalize_columns():
-            raw = list(self.df.columns)
-            normalized: list[str] = []
-            for c in raw:
-                m = re.match(r"^(.+)_(\d+)$", str(c))
-                if m and m.group(1) in normalized:
-                    normalized.append(m.group(1))
-                else:
-                    normalized.append(str(c))
-            self.df.columns = normalized
-        self.register()
+        if self.cache is not None and not isinstance(params, list):
+            # AND-ed terms commute; sorting them canonicalizes the cache key.
+            # Positional parameters pin the order, so those are left alone.
+            if all(isinstance(term, str) for term in where):
+                where = sorted(where)
+        try:
+            query = _render_sql(
+                tuple(select),
+                "current_df",
+                tuple(where),
+                tuple(group_by),
+                having,
+                tuple(order_by),
+                limit,
+                offset,
+                tuple(_join_shape(join) for join in processed_joins),
+            )
+        except TypeError:
+            # Unhashable arguments: build without the shape cache
+            query = _build_sql(
+                select,
+                "current_df",
+                where,
+                group_by,
+                having,
+                order_by,
+                limit,
+                offset,
+                processed_joins,
+            )
+        return query
+
+    @_instrumented
+    def run_query(
+        self,
+        select: list = [],
+        where: list = [],
+        group_by: list = [],
+        having: Optional[int] = None,
+        order_by: list = [],
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        joins: list = [],
+        params: Params = None,
+        stream: bool = False,
+    ) -> "List":
+        """Render and run a SELECT over current_df (plus registered joins).
+
+        Values for ``?`` or ``$name`` placeholders in `where`/`having` are
+        passed through `params` and bound by DuckDB, so queries that differ
+        only by literal values reuse one cached rendering of the template.
+
+        With `stream=True` the query is deferred as in lazy mode so that
+        `iter_batches()` can stream a result larger than memory.
+
+        `select` may also be an m_ast pipeline (see m_ast.compile_plan) over
+        current_df and registered tables; it is optimized with their columns
+        as schema and folded into one statement.
+        """
+        started = time.perf_counter()
+        if isinstance(select, PLAN_NODES):
+            defer = self.lazy or stream
+            sql = self._compile_plan(optimize(select, self._plan_schema()), defer)
+            self._rendered(started)
+            return self._apply(sql, params, defer=stream)
+        query = self._render_query(
+            select, where, group_by, having, order_by, limit, offset, joins, params
+        )
+        self._rendered(started)
+        if self.lazy or stream:
+            self._apply(query, params, defer=True)
+            self._normalize_pending = get_normalize_columns()
+            return self
+        source = self._frame
+        key = self._cache_key(query, params)
+        if key is not None and self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.df = cached
+                return self._register_current()
+        frame = self._fetch(query, params)
+        self.df = self._normalize(frame) if get_normalize_columns() else frame
+        if key is not None and self.cache is not None:
+            deps = [source, *self.registered_tables.values()]
+            self.cache.put(key, self._frame, deps)
+        self._register_current()
         return self
+
+    def _rendered(self, started: float) -> None:
+        """Charge the time since *started* to the current call's rendering."""
+        if self._record is not None:
+            self._record.render_time += time.perf_counter() - started
+
+    def _profiled(self, query: str, params: Params = None) -> dict:
+        """Run *query* over current_df with DuckDB's JSON profiler on."""
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            self.db.execute("PRAGMA enable_profiling='json'")
+            self.db.execute(f"SET profiling_output={_sql_literal(path)}")
+            try:
+                # The profile is written once the result has been consumed
+                rel = self._execute(query, params)
+                rel.fetch_arrow_table() if pa is not None else rel.fetchall()
+            finally:
+                self.db.execute("PRAGMA disable_profiling")
+                self.db.execute("RESET profiling_output")
+            with open(path) as fh:
+                return json.load(fh)
+        finally:
+            os.remove(path)
+
+    def profile(self, query: Union[str, dict], params: Params = None) -> dict:
+        """Profile a query over current_df and attribute the cost to its clauses.
+
+        Args:
+            query: SQL over current_df, or a dict of run_query keyword
+                arguments (an m_ast pipeline as `select` is handed to
+                explain()). current_df is not changed.
+            params: Values for placeholders, unless given in the dict.
+
+        Returns:
+            ``{"sql", "latency", "rows", "peak_memory", "steps", "operators"}``
+            where each step is ``{"step": clause, "time", "rows", "bytes",
+            "operators"}`` for one of select, from, joins, where, group_by,
+            having, order_by and limit, and `operators` lists every DuckDB
+            operator with its timing, row count, output bytes and step.
+        """
+        if isinstance(query, dict):
+            spec = dict(query)
+            params = spec.pop("params", params)
+            spec.pop("stream", None)
+            if isinstance(spec.get("select"), PLAN_NODES):
+                return self.explain(spec["select"], analyze=True, params=params)
+            query = self._render_query(**spec, params=params)
+        profile = self._profiled(query, params)
+        ops = _flatten_profile(profile)
+        clauses = list(dict.fromkeys(_operator_clause(ops)))
+        for op, clause in zip(ops, _operator_clause(ops)):
+            op["step"] = clauses.index(clause)
+        report = _profile_report(profile, ops, [(c, {}) for c in clauses])
+        for op in ops:
+            op["step"] = clauses[op["step"]]
+        return dict(sql=query, **report)
+
+    def explain(self, plan: Any, analyze: bool = True, params: Params = None) -> dict:
+        """Explain an m_ast pipeline over current_df, step by step.
+
+        The plan is optimized and compiled as run_query would. Without
+        `analyze` this returns ``{"sql", "plan", "steps"}`` with DuckDB's
+        physical plan text. With `analyze` the statement runs once under the
+        profiler and each DuckDB operator is mapped to the AST step that
+        produced it: by matching its details against EXPLAIN output of each
+        step's subplan, then by the table it scans, and otherwise to the step
+        of the operator above it. Steps then carry ``time``, ``rows`` (output
+        rows), ``bytes`` and ``operators`` as in profile(). current_df is not
+        changed.
+        """
+        plan = optimize(plan, self._plan_schema())
+        sql = self._compile_plan(plan)
+        steps = _plan_steps(plan)
+        if not analyze:
+            text = self.db.execute(
+                f"EXPLAIN {self._sql(sql)}", self._bind(params)
+            ).fetchall()
+            return {
+                "sql": sql,
+                "plan": "\n".join(row[1] for row in text),
+                "steps": [{"step": explain_step(n), "node": n} for n in steps],
+            }
+
+        signatures, sources = [], []
+        for step in steps:
+            step_sql = self._sql(self._compile_plan(step))
+            rows = self.db.execute(
+                f"EXPLAIN (FORMAT JSON) {step_sql}", self._bind(params)
+            ).fetchall()
+            found = _flatten_profile({"children": json.loads(rows[0][1])})
+            signatures.append({_operator_signature(op["extra_info"]) for op in found})
+            sources.append({_operator_source(op["extra_info"]) for op in found})
+
+        profile = self._profiled(sql, params)
+        ops = _flatten_profile(profile)
+        root = len(steps) - 1
+        for op in ops:
+            sig = _operator_signature(op["extra_info"])
+            src = _operator_source(op["extra_info"])
+            match = next(
+                (i for i, s in enumerate(signatures) if sig and sig in s), None
+            )
+            if match is None and src:
+                match = next((i for i, s in enumerate(sources) if src in s), None)
+            if match is None:
+                parent = op["parent"]
+                match = root if parent is None else ops[parent]["step"]
+            op["step"] = match
+        report = _profile_report(
+            profile, ops, [(explain_step(n), {"node": n}) for n in steps]
+        )
+        for op in ops:
+            op["step"] = explain_step(steps[op["step"]])
+        return dict(sql=sql, **report)
+
+    def run_many(self, specs: list, max_workers: int = 4) -> list:
+        """Run independent run_query specs concurrently and return their results.
+
+        Each spec is a dict of run_query keyword arguments applied to the
+        current current_df (the List itself is left unchanged). Queries run
+        on up to `max_workers` cursors of this List's database, each with the
+        same frames registered by reference, so the base data is not copied.
+        Results come back in spec order as dataframes (Arrow tables in Arrow
+        mode).
+        """
+        if not specs:
+            return []
+        idle: "queue.Queue[List]" = queue.Queue()
+        for _ in range(min(max_workers, len(specs))):
+            idle.put(self._task_copy())
+
+        def work(spec: dict) -> Frame:
+            task = idle.get()
+            try:
+                result = task.run_query(**spec).collect()._frame
+            finally:
+                # Hand the cursor back with the base current_df re-attached
+                task._adopt(self)
+                if task._plan is not None and task._frame is not None:
+                    task._register_current()
+                idle.put(task)
+            return result
+
+        try:
+            with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(work, specs))
+        finally:
+            while not idle.empty():
+                idle.get().db.close()
+
+    def _cache_key(self, query: str, params: Params) -> Optional[tuple]:
+        """Build the result-cache key for *query*, or None when not cacheable."""
+        if self.cache is None or self._frame is None:
+            # File-backed sources can change underneath us: never cache them
+            return None
+        bound = self._bind(params)
+        if isinstance(bound, dict):
+            bound = sorted(bound.items())
+        key = (
+            _canonical_sql(self._sql(query)),
+            tuple(bound or ()),
+            _fingerprint(self._frame),
+            tuple(
+                (name, _fingerprint(tdf))
+                for name, tdf in sorted(self.registered_tables.items())
+            ),
+            get_normalize_columns(),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+
+class AsyncList:
+    """asyncio front end for a List.
+
+    Every call runs on a bounded thread pool against its own DuckDB cursor,
+    so concurrent requests overlap instead of blocking the event loop.
+    Statistics (`mean`, `stdev_s`, `quantile`, `stats`, ...) run concurrently;
+    transforms (`run_query`, `filter`, ...) and `data` are serialized because
+    they replace current_df. Cancelling a task interrupts its DuckDB query.
+    """
+
+    def __init__(
+        self,
+        lst: List,
+        max_workers: int = 4,
+        executor: Optional["futures.Executor"] = None,
+    ):
+        self.list = lst
+        self._owns_executor = executor is None
+        self._executor = executor or futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="duckquery"
+        )
+        self._write_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "AsyncList":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.close()
+        return False
+
+    def close(self) -> None:
+        if self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self.list.close()
+
+    async def _run(self, fn: Callable[[List], Any]) -> Any:
+        """Run fn on a copy of the List bound to its own cursor, off the loop."""
+        task = self.list._task_copy()
+        cur = task.db
+
+        def work() -> Any:
+            try:
+                return fn(task)
+            finally:
+                cur.close()
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, work)
+        except asyncio.CancelledError:
+            # The worker thread keeps running until DuckDB sees the interrupt
+            cur.interrupt()
+            raise
+
+    async def _transform(self, method: str, *args, **kwargs) -> "AsyncList":
+        async with self._write_lock:
+            task = await self._run(lambda t: getattr(t, method)(*args, **kwargs))
+            self.list._adopt(task)
+        return self
+
+    async def _statistic(self, method: str, *args) -> Optional[float]:
+        task = await self._run(lambda t: getattr(t, method)(*args))
+        self.list.value = task.value
+        return task.value
+
+    async def run_query(self, **kwargs) -> "AsyncList":
+        return await self._transform("run_query", **kwargs)
+
+    async def filter(self, condition: str) -> "AsyncList":
+        return await self._transform("filter", condition)
+
+    async def select(self, cols: list) -> "AsyncList":
+        return await self._transform("select", cols)
+
+    async def order(self, ordering: list) -> "AsyncList":
+        return await self._transform("order", ordering)
+
+    async def limit(self, limit: int) -> "AsyncList":
+        return await self._transform("limit", limit)
+
+    async def mean(self, col: str) -> Optional[float]:
+        return await self._statistic("mean", col)
+
+    async def stdev_s(self, col: str) -> Optional[float]:
+        return await self._statistic("stdev_s", col)
+
+    async def quantile(self, col: str, percentile: float) -> Optional[float]:
+        return await self._statistic("quantile", col, percentile)
+
+    async def outlier(self, col: str, tail: Outlier) -> Optional[float]:
+        return await self._statistic("outlier", col, tail)
+
+    async def median_of_means(self, group_col: str, mean_col: str) -> Optional[float]:
+        return await self._statistic("median_of_means", group_col, mean_col)
+
+    async def stats(self, spec) -> Dict[str, Dict[Any, Any]]:
+        return await self._run(lambda t: t.stats(spec))
+
+    async def data(self) -> "pd.DataFrame":
+        await self._transform("collect")
+        return self.list.data()
@@ -0,0 +1,103 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import math
+
+import pandas as pd
+import pytest
+from main import ConnectionPool, List
+
+
+def _frame():
+    return pd.DataFrame(
+        {
+            "id": [1, 2, 3, 4],
+            "score": [10.0, 12.5, None, 9.0],
+            "dept": ["IT", "HR", "IT", "HR"],
+        }
+    )
+
+
+def _chunk(start, n):
+    return pd.DataFrame(
+        {
+            "dept": ["IT"] * n,
+            "id": list(range(start, start + n)),
+            "score": [float(v % 7) for v in range(start, start + n)],
+        }
+    )
+
+
+def test_append_inserts_rows_by_name():
+    with List(_frame()) as lst:
+        lst.append(_chunk(5, 3))
+        result = lst.data()
+        assert list(result["id"]) == [1, 2, 3, 4, 5, 6, 7]
+        assert list(result.columns) == ["id", "score", "dept"]
+
+
+def test_running_stats_match_full_scan():
+    chunks = [_chunk(5, 10), _chunk(15, 1), _chunk(16, 25)]
+    full = pd.concat([_frame()] + chunks, ignore_index=True)
+    with List(_frame()) as lst:
+        for chunk in chunks:
+            lst.append(chunk)
+        assert lst.mean("score").result() == pytest.approx(full["score"].mean())
+        assert lst.stdev_s("score").result() == pytest.approx(full["score"].std())
+        assert lst._moments["id"].total == full["id"].sum()
+        assert lst._moments["score"].n == full["score"].count()
+
+
+def test_mean_does_not_rescan_after_append():
+    with List(_frame()) as lst:
+        lst.append(_chunk(5, 3), table="history")
+        # Swap the table contents behind the List's back: running state wins
+        lst.db.execute('DELETE FROM "history"')
+        assert lst.mean("id").result() == pytest.approx(4.0)
+
+
+def test_transforms_fall_back_to_scanning():
+    with List(_frame()) as lst:
+        lst.append(_chunk(5, 3))
+        lst.filter("dept = 'HR'")
+        assert lst.mean("id").result() == 3.0
+        # A new append starts tracking again from the filtered rows
+        lst.append(_chunk(10, 2))
+        assert lst.mean("id").result() == pytest.approx((2 + 4 + 10 + 11) / 4)
+
+
+def test_append_tracks_selected_columns_and_arrow_chunks():
+    pa = pytest.importorskip("pyarrow")
+    with List(_frame()) as lst:
+        lst.append(pa.Table.from_pandas(_chunk(5, 2)), track=["score"])
+        assert set(lst._moments) == {"score"}
+        # Untracked columns are still answered by DuckDB
+        assert lst.mean("id").result() == 3.5
+        assert math.isclose(
+            lst.stdev_s("score").result(), pd.Series([10.0, 12.5, 9.0, 5, 6]).std()
+        )
+
+
+def test_pooled_lists_append_to_their_own_tables():
+    pool = ConnectionPool()
+    with List(_frame(), pool=pool) as a, List(_frame(), pool=pool) as b:
+        a.append(_chunk(5, 3))
+        b.append(_chunk(10, 1))
+        a.append(_chunk(8, 1))
+        assert list(a.data()["id"]) == [1, 2, 3, 4, 5, 6, 7, 8]
+        assert list(b.data()["id"]) == [1, 2, 3, 4, 10]
+
+
+def test_append_to_lazy_and_file_backed_lists(tmp_path):
+    with List(_frame(), lazy=True) as lst:
+        lst.run_query(where=["id > ?"], params=[2]).append(_chunk(5, 2))
+        assert list(lst.data()["id"]) == [3, 4, 5, 6]
+        assert lst.mean("id").result() == 4.5
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "frame.parquet")
+    _frame().to_parquet(path)
+    with List.from_parquet(path) as lst:
+        lst.append(_chunk(5, 1))
+        assert list(lst.data()["id"]) == [1, 2, 3, 4, 5]
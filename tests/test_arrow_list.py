@@ -0,0 +1,68 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest
+import pandas as pd
+from main import List, Jointype
+
+pa = pytest.importorskip("pyarrow")
+
+
+def _table():
+    return pa.table(
+        {
+            "id": [1, 2, 3, 4],
+            "name": ["Alice", "Bob", "Charlie", "David"],
+            "dept_id": [1, 2, 1, 3],
+        }
+    )
+
+
+def test_arrow_table_input_enables_arrow_mode():
+    with List(_table()) as lst:
+        assert lst.arrow
+        lst.filter("dept_id = 1")
+        # Intermediates stay as Arrow until data() is called
+        assert isinstance(lst._frame, pa.Table)
+        assert lst._pandas is None
+        result = lst.data()
+        assert isinstance(result, pd.DataFrame)
+        assert list(result["name"]) == ["Alice", "Charlie"]
+
+
+def test_record_batch_reader_input():
+    reader = pa.RecordBatchReader.from_batches(
+        _table().schema, _table().to_batches(max_chunksize=2)
+    )
+    with List(reader) as lst:
+        assert lst.mean("id").result() == 2.5
+        assert lst.select(["name"]).to_arrow().num_rows == 4
+
+
+def test_arrow_mode_from_pandas_input():
+    df = _table().to_pandas()
+    with List(df, arrow=True) as lst:
+        lst.order(["id DESC"]).limit(2)
+        assert isinstance(lst.to_arrow(), pa.Table)
+        assert list(lst.data()["id"]) == [4, 3]
+
+
+def test_arrow_run_query_with_arrow_join_table():
+    depts = pa.table({"dept_id": [1, 2, 3], "dept_name": ["Eng", "Sales", "HR"]})
+    with List(_table()) as lst:
+        lst.register_table("departments", depts)
+        result = lst.run_query(
+            select=["name", "dept_name"],
+            joins=[
+                {
+                    "type": Jointype.INNER,
+                    "table": "departments",
+                    "using": ["dept_id"],
+                }
+            ],
+            order_by=["name"],
+        )
+        assert isinstance(result._frame, pa.Table)
+        assert list(result.data()["dept_name"]) == ["Eng", "Sales", "Eng", "HR"]
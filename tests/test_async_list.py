@@ -0,0 +1,83 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import asyncio
+import time
+import pandas as pd
+import pytest
+from main import List, AsyncList
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame(
+        {
+            "id": [1, 2, 3, 4, 5],
+            "age": [25, 30, 35, 40, 45],
+            "department": ["IT", "HR", "IT", "Finance", "IT"],
+        }
+    )
+
+
+def test_async_statistics_run_concurrently(sample_df):
+    async def main():
+        async with AsyncList(List(sample_df)) as alst:
+            return await asyncio.gather(
+                alst.mean("age"),
+                alst.stdev_s("age"),
+                alst.quantile("age", 0.5),
+                alst.stats({"id": ["max"]}),
+            )
+
+    mean, std, median, stats = asyncio.run(main())
+    assert mean == sample_df["age"].mean()
+    assert std == pytest.approx(sample_df["age"].std())
+    assert median == 35
+    assert stats == {"id": {"max": 5}}
+
+
+def test_async_transforms_update_the_list(sample_df):
+    async def main():
+        async with AsyncList(List(sample_df)) as alst:
+            await alst.run_query(where=["age > ?"], params=[28])
+            await alst.filter("department = 'IT'")
+            mean = await alst.mean("age")
+            return mean, await alst.data()
+
+    mean, data = asyncio.run(main())
+    assert mean == 40
+    assert data["id"].tolist() == [3, 5]
+
+
+def test_async_lazy_data_materializes_off_the_loop(sample_df):
+    async def main():
+        async with AsyncList(List(sample_df, lazy=True)) as alst:
+            await alst.order(["age DESC"])
+            await alst.limit(2)
+            return await alst.data()
+
+    assert asyncio.run(main())["age"].tolist() == [45, 40]
+
+
+def test_cancelling_a_task_interrupts_duckdb(sample_df):
+    slow = "(SELECT count(*) FROM range(100000000000) t(i) WHERE i * i % 7 = 3) > 0"
+
+    async def main():
+        async with AsyncList(List(sample_df), max_workers=1) as alst:
+            task = asyncio.create_task(alst.filter(slow))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            # The single worker is free again once DuckDB has been interrupted
+            start = time.perf_counter()
+            mean = await asyncio.wait_for(alst.mean("age"), timeout=10)
+            return mean, time.perf_counter() - start, alst.list.data()
+
+    mean, elapsed, data = asyncio.run(main())
+    assert mean == 35
+    assert elapsed < 10
+    # The cancelled transform never replaced current_df
+    assert len(data) == len(sample_df)
@@ -0,0 +1,152 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import asyncio
+
+import pandas as pd
+import pytest
+from m_ast.nodes import Buffer, Group, SelectColumns, SelectRows
+from main import AsyncList, List
+
+
+def _frames():
+    sales = pd.DataFrame(
+        {
+            "region": ["N", "S", "N", "E", "S"],
+            "amount": [10, -1, 30, 40, 50],
+        }
+    )
+    base = pd.DataFrame({"id": [1, 2]})
+    return base, sales
+
+
+def _buffer_tables(lst):
+    rows = lst.db.execute(
+        "SELECT table_name FROM duckdb_tables() WHERE temporary"
+    ).fetchall()
+    return sorted(r[0] for r in rows)
+
+
+def _cleaned():
+    return Buffer(SelectRows("sales", "amount > 0"))
+
+
+def test_buffer_is_materialized_once_and_reused():
+    base, sales = _frames()
+    with List(base) as lst:
+        lst.register_table("sales", sales)
+        north = lst.run_query(select=SelectRows(_cleaned(), "region = 'N'")).data()
+        assert list(north["amount"]) == [10, 30]
+        tables = _buffer_tables(lst)
+        assert len(tables) == 1 and tables[0].startswith("_buffer_")
+
+        totals = lst.run_query(
+            select=Group(_cleaned(), ["region"], {"total": "SUM(amount)"})
+        ).data()
+        assert dict(zip(totals["region"], totals["total"])) == {
+            "N": 40,
+            "E": 40,
+            "S": 50,
+        }
+        assert _buffer_tables(lst) == tables
+
+
+def test_buffer_is_rebuilt_when_its_input_changes():
+    base, sales = _frames()
+    with List(base) as lst:
+        lst.register_table("sales", sales)
+        lst.run_query(select=SelectColumns(_cleaned(), ["amount"]))
+        lst.register_table("sales", sales[sales["region"] == "N"])
+        result = lst.run_query(select=SelectColumns(_cleaned(), ["amount"])).data()
+        assert list(result["amount"]) == [10, 30]
+        assert len(_buffer_tables(lst)) == 1
+
+
+def test_superseded_buffers_are_dropped():
+    base, sales = _frames()
+    with List(base) as lst:
+        for _ in range(5):
+            lst.register_table("sales", sales.copy())
+            result = lst.run_query(select=SelectColumns(_cleaned(), ["amount"]))
+            assert list(result.data()["amount"]) == [10, 30, 40, 50]
+        assert len(_buffer_tables(lst)) == 1
+        assert len(lst._buffers) == 1
+
+
+def test_buffer_over_lazy_current_df():
+    _, sales = _frames()
+    with List(sales, lazy=True) as lst:
+        lst.filter("region <> 'E'")
+        plan = SelectRows(Buffer(SelectRows("current_df", "amount > 0")), "amount > 20")
+        result = lst.run_query(select=plan).data()
+        assert sorted(result["amount"]) == [30, 50]
+
+
+def test_buffers_are_dropped_on_close():
+    base, sales = _frames()
+    lst = List(base)
+    lst.register_table("sales", sales)
+    lst.run_query(select=SelectRows(_cleaned(), "region = 'S'"))
+    assert len(_buffer_tables(lst)) == 1
+    names = [name for name, _ in lst._buffers.values()]
+    lst.close()
+    assert lst._buffers == {}
+    assert names and lst.db is None
+
+
+def test_parameterized_buffer_stays_inline():
+    base, sales = _frames()
+    with List(base) as lst:
+        lst.register_table("sales", sales)
+        plan = Buffer(SelectRows("sales", "amount > ?"))
+        result = lst.run_query(select=plan, params=[35]).data()
+        assert sorted(result["amount"]) == [40, 50]
+        assert _buffer_tables(lst) == []
+
+
+def test_deferred_buffers_stay_inline_for_other_cursors():
+    pytest.importorskip("pyarrow")
+    base, sales = _frames()
+    plan = SelectRows(_cleaned(), "amount > 20")
+    with List(base) as lst:
+        lst.register_table("sales", sales)
+        batches = lst.run_query(select=plan, stream=True).iter_batches()
+        assert sum(b.num_rows for b in batches) == 3
+        assert _buffer_tables(lst) == []
+    with List(sales, lazy=True) as lst:
+        lst.run_query(select=Buffer(SelectRows("current_df", "amount > 0")))
+        lst.run_query(select=Buffer(SelectRows("current_df", "amount > 20")))
+        assert sum(b.num_rows for b in lst.iter_batches()) == 3
+
+    async def main():
+        async with AsyncList(List(sales, lazy=True)) as alst:
+            await alst.run_query(select=Buffer(SelectRows("current_df", "amount > 0")))
+            return await alst.data()
+
+    assert len(asyncio.run(main())) == 4
+
+
+def test_buffer_over_a_table_current_df_sees_appended_rows():
+    _, sales = _frames()
+    with List(sales) as lst:
+        lst.append(sales.head(1))
+        lst.append(sales.head(1))
+        plan = Group(
+            Buffer(SelectRows("current_df", "amount > 0")), [], {"n": "COUNT(*)"}
+        )
+        assert lst.run_query(select=plan).data()["n"].tolist() == [6]
+        assert _buffer_tables(lst) == []
+
+
+def test_register_after_an_in_place_edit_rebuilds_buffers():
+    base, sales = _frames()
+    with List(base) as lst:
+        lst.register_table("sales", sales)
+        plan = SelectColumns(_cleaned(), ["amount"])
+        lst.run_query(select=plan)
+        sales.loc[0, "amount"] = 99
+        lst.df = base
+        lst.register()
+        assert 99 in list(lst.run_query(select=plan).data()["amount"])
@@ -0,0 +1,73 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pandas as pd
+from main import List, ConnectionPool
+
+
+def test_index_tracks_registered_table_columns():
+    with List(pd.DataFrame({"id": [1], "name": ["A"]})) as lst:
+        lst.register_table("depts", pd.DataFrame({"id": [1], "dept": ["X"]}))
+        assert set(lst._column_tables["dept"]) == {"depts"}
+        assert set(lst._column_tables["id"]) == {"depts"}
+        # Re-registering a name replaces its columns in the index
+        lst.register_table("depts", pd.DataFrame({"id": [1], "floor": [2]}))
+        assert "dept" not in lst._column_tables
+        assert set(lst._column_tables["floor"]) == {"depts"}
+
+
+def test_select_qualification_uses_first_registered_table():
+    main_df = pd.DataFrame({"id": [1, 2], "dept_id": [10, 20]})
+    with List(main_df) as lst:
+        lst.register_table("a", pd.DataFrame({"dept_id": [10], "label": ["a"]}))
+        lst.register_table("b", pd.DataFrame({"dept_id": [20], "label": ["b"]}))
+        # Replacing "a" keeps its original registration rank
+        lst.register_table("a", pd.DataFrame({"dept_id": [10], "label": ["a2"]}))
+        result = lst.run_query(
+            select=["id", "label"],
+            joins=[{"type": "INNER", "table": "a", "using": ["dept_id"]}],
+        ).data()
+        assert result["label"].tolist() == ["a2"]
+
+
+def test_ambiguous_column_is_qualified_with_current_df():
+    main_df = pd.DataFrame({"id": [1, 2], "dept_id": [10, 20]})
+    with List(main_df) as lst:
+        lst.register_table("d", pd.DataFrame({"id": [10, 20], "name": ["x", "y"]}))
+        result = lst.run_query(
+            select=["id", "name"],
+            joins=[
+                {
+                    "type": "INNER",
+                    "table": "d",
+                    "condition": "current_df.dept_id = d.id",
+                }
+            ],
+        ).data()
+        assert result["id"].tolist() == [1, 2]
+
+
+def test_column_added_in_place_is_seen_after_register():
+    main_df = pd.DataFrame({"id": [1, 2], "dept_id": [10, 20]})
+    with List(main_df) as lst:
+        lst.register_table("d", pd.DataFrame({"dept_id": [10, 20], "score": [7, 8]}))
+        joins = [{"type": "INNER", "table": "d", "using": ["dept_id"]}]
+        lst.run_query(select=["id"], joins=joins)
+        lst.df = main_df
+        main_df["score"] = [1, 2]
+        lst.register()
+        result = lst.run_query(select=["score"], joins=joins).data()
+        assert result["score"].tolist() == [1, 2]
+
+
+def test_pooled_lists_index_shared_tables():
+    pool = ConnectionPool()
+    pool.register_table("ref", pd.DataFrame({"code": [1]}))
+    lst = List(pd.DataFrame({"x": [1]}), pool=pool)
+    assert set(lst._column_tables["code"]) == {"ref"}
+    pool.register_table("other", pd.DataFrame({"flag": [True]}))
+    assert set(lst._column_tables["flag"]) == {"other"}
+    lst.close()
+    pool.close()
@@ -0,0 +1,151 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import duckdb
+import pandas as pd
+import pytest
+from m_ast import compile_plan
+from m_ast.nodes import (
+    AddColumn,
+    Buffer,
+    Group,
+    Join,
+    Pivot,
+    RenameColumns,
+    SelectColumns,
+    SelectRows,
+    Unpivot,
+)
+from main import List
+
+
+@pytest.fixture
+def con():
+    con = duckdb.connect()
+    con.register(
+        "employees",
+        pd.DataFrame(
+            {
+                "id": [1, 2, 3, 4],
+                "age": [25, 35, 45, 55],
+                "dept_id": [1, 2, 1, 3],
+            }
+        ),
+    )
+    con.register(
+        "departments",
+        pd.DataFrame({"dept_id": [1, 2, 3], "dept_name": ["Eng", "Sales", "HR"]}),
+    )
+    yield con
+    con.close()
+
+
+def test_filters_and_projection_fold_into_one_select():
+    plan = SelectColumns(
+        SelectRows(SelectRows("employees", "age >= 30"), "dept_id = 1 OR id = 2"),
+        ["id", "age"],
+    )
+    assert compile_plan(plan) == (
+        'SELECT "id", "age" FROM "employees" '
+        "WHERE (age >= 30) AND (dept_id = 1 OR id = 2)"
+    )
+
+
+def test_filter_after_computed_column_nests(con):
+    plan = SelectRows(AddColumn("employees", "decade", "age // 10"), "decade = 4")
+    sql = compile_plan(plan)
+    assert sql.startswith("SELECT * FROM (SELECT *, age // 10 AS")
+    assert con.execute(sql).fetchall() == [(3, 45, 1, 4)]
+
+
+def test_rename_then_group(con):
+    plan = Group(
+        RenameColumns(SelectRows("employees", "age > 30"), {"dept_id": "dept"}),
+        ["dept"],
+        {"n": "COUNT(*)", "oldest": "MAX(age)"},
+    )
+    rows = con.execute(compile_plan(plan) + " ORDER BY dept").fetchall()
+    assert rows == [(1, 1, 45), (2, 1, 35), (3, 1, 55)]
+
+
+def test_join_with_same_and_different_key_names(con):
+    same = Join("employees", "departments", {"dept_id": "dept_id"}, "left")
+    assert 'USING ("dept_id")' in compile_plan(same)
+    renamed = RenameColumns("departments", {"dept_id": "key"})
+    plan = SelectColumns(
+        SelectRows(Join("employees", renamed, {"dept_id": "key"}), "age < 50"),
+        ["id", "dept_name"],
+    )
+    rows = con.execute(compile_plan(plan) + " ORDER BY id").fetchall()
+    assert rows == [(1, "Eng"), (2, "Sales"), (3, "Eng")]
+
+
+def test_three_table_joins_nest_on_either_side(con):
+    con.register(
+        "locations",
+        pd.DataFrame({"dept_id": [1, 2, 3], "city": ["Oslo", "Lima", "Pune"]}),
+    )
+    inner = Join("employees", "departments", {"dept_id": "dept_id"})
+    left_deep = Join(inner, "locations", {"dept_id": "dept_id"})
+    right_deep = Join(
+        "employees",
+        Join("departments", "locations", {"dept_id": "dept_id"}),
+        {"dept_id": "dept_id"},
+    )
+    expected = [(1, "Eng", "Oslo"), (2, "Sales", "Lima"), (3, "Eng", "Oslo")]
+    for plan in (left_deep, right_deep):
+        sql = compile_plan(
+            SelectColumns(SelectRows(plan, "age < 50"), ["id", "dept_name", "city"])
+        )
+        assert con.execute(sql + " ORDER BY id").fetchall() == expected
+    on_keys = Join(
+        inner, RenameColumns("locations", {"dept_id": "key"}), {"dept_id": "key"}
+    )
+    sql = compile_plan(SelectColumns(on_keys, ["id", "city"]))
+    assert len(con.execute(sql).fetchall()) == 4
+
+
+def test_pivot_and_unpivot_read_from_ctes(con):
+    pivot = Pivot(
+        SelectColumns("employees", ["dept_id", "age"]),
+        "dept_id",
+        "age",
+        "sum",
+        ["1", "2"],
+    )
+    assert con.execute(compile_plan(pivot)).fetchall() == [(70, 35)]
+    plan = Unpivot(pivot, ["1", "2"], "dept", "total")
+    sql = compile_plan(plan)
+    assert sql.startswith("WITH ")
+    assert sorted(con.execute(sql).fetchall()) == [("1", 70), ("2", 35)]
+
+
+def test_buffer_is_a_materialized_boundary(con):
+    plan = SelectRows(Buffer(SelectRows("employees", "age > 30")), "dept_id = 1")
+    sql = compile_plan(plan)
+    assert sql == (
+        'WITH "_s1" AS MATERIALIZED (SELECT * FROM "employees" WHERE age > 30) '
+        'SELECT * FROM "_s1" WHERE dept_id = 1'
+    )
+    assert con.execute(sql).fetchall() == [(3, 45, 1)]
+
+
+def test_compile_rejects_unknown_inputs():
+    with pytest.raises(TypeError):
+        compile_plan(SelectRows(42, "x > 1"))
+
+
+def test_run_query_folds_pipeline():
+    df = pd.DataFrame({"id": [1, 2, 3], "age": [20, 40, 60]})
+    with List(df, lazy=True) as lst:
+        plan = SelectColumns(
+            SelectRows(AddColumn("current_df", "older", "age + ?"), "older > ?"),
+            ["id", "older"],
+        )
+        lst.run_query(select=plan, params=[5, 30])
+        assert lst._plan is not None
+        result = lst.data()
+        assert list(result["id"]) == [2, 3]
+        assert list(result["older"]) == [45, 65]
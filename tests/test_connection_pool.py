@@ -0,0 +1,56 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pandas as pd
+from main import List, ConnectionPool, Jointype, default_pool
+
+
+def test_pooled_lists_share_one_database():
+    pool = ConnectionPool()
+    a = List(pd.DataFrame({"x": [1, 2, 3]}), pool=pool)
+    b = List(pd.DataFrame({"x": [10, 20]}), pool=pool)
+    # Each List sees its own current_df through its cursor
+    assert a.mean("x").result() == 2
+    assert b.mean("x").result() == 15
+    a.db.execute("CREATE TABLE shared_t AS SELECT 42 AS v")
+    assert b.db.execute("SELECT v FROM shared_t").fetchone()[0] == 42
+    a.close()
+    b.close()
+    pool.close()
+
+
+def test_register_table_is_visible_to_all_pooled_lists():
+    pool = ConnectionPool()
+    depts = pd.DataFrame({"dept_id": [1, 2], "dept_name": ["Eng", "Sales"]})
+    first = List(pd.DataFrame({"name": ["A"], "dept_id": [1]}), pool=pool)
+    second = List(pd.DataFrame({"name": ["B"], "dept_id": [2]}), pool=pool)
+    first.register_table("departments", depts)
+    # Registered after `second` was created and without registering it again
+    third = List(pd.DataFrame({"name": ["C"], "dept_id": [1]}), pool=pool)
+    for lst, expected in [(second, "Sales"), (third, "Eng")]:
+        result = lst.run_query(
+            select=["name", "dept_name"],
+            joins=[
+                {"type": Jointype.INNER, "table": "departments", "using": ["dept_id"]}
+            ],
+        ).data()
+        assert result["dept_name"].tolist() == [expected]
+    for lst in (first, second, third):
+        lst.close()
+    pool.close()
+
+
+def test_closing_pooled_list_keeps_pool_open():
+    pool = ConnectionPool()
+    with List(pd.DataFrame({"x": [1]}), pool=pool) as lst:
+        pass
+    assert lst.db is None
+    with List(pd.DataFrame({"x": [5]}), pool=pool) as other:
+        assert other.mean("x").result() == 5
+    pool.close()
+
+
+def test_default_pool_is_a_singleton():
+    assert default_pool() is default_pool()
@@ -0,0 +1,52 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pandas as pd
+import pytest
+from main import List, ConnectionPool
+
+
+def _setting(lst, name):
+    return lst.db.execute(f"SELECT current_setting('{name}')").fetchone()[0]
+
+
+def test_resource_settings_are_applied(tmp_path):
+    spill = str(tmp_path / "spill")
+    df = pd.DataFrame({"x": [1, 2, 3]})
+    with List(df, memory_limit="256MB", threads=2, temp_directory=spill) as lst:
+        assert _setting(lst, "threads") == 2
+        assert _setting(lst, "temp_directory") == spill
+        assert "MiB" in _setting(lst, "memory_limit")
+        assert lst.mean("x").result() == 2
+
+
+def test_persisted_state_lives_in_on_disk_database(tmp_path):
+    path = str(tmp_path / "work.duckdb")
+    df = pd.DataFrame({"id": range(10), "grp": ["a", "b"] * 5})
+    with List(df, database=path) as lst:
+        lst.filter("grp = 'a'").persist("stage_a")
+        assert lst._frame is None
+        assert lst.mean("id").result() == 4
+        assert lst.order(["id DESC"]).limit(1).data()["id"].tolist() == [8]
+    # The intermediate table survives the List and can be reopened
+    with List(None, database=path) as again:
+        rows = again.db.execute("SELECT COUNT(*) FROM stage_a").fetchone()[0]
+        assert rows == 5
+
+
+def test_persist_runs_a_pending_lazy_plan(tmp_path):
+    df = pd.DataFrame({"id": range(10), "grp": ["a", "b"] * 5})
+    with List(df, lazy=True, database=str(tmp_path / "lazy.duckdb")) as lst:
+        lst.filter("id > 1").run_query(where=["grp = ?"], params=["a"])
+        lst.persist("stage")
+        assert lst._plan == 'SELECT * FROM "stage"'
+        assert lst.data()["id"].tolist() == [2, 4, 6, 8]
+
+
+def test_pooled_list_rejects_database_settings():
+    pool = ConnectionPool(threads=1)
+    with pytest.raises(ValueError, match="ConnectionPool"):
+        List(pd.DataFrame({"x": [1]}), pool=pool, memory_limit="1GB")
+    pool.close()
@@ -0,0 +1,79 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pandas as pd
+import pytest
+from main import List
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def sales_df():
+    return pd.DataFrame(
+        {
+            "id": range(1, 101),
+            "region": ["North", "South", "East", "West"] * 25,
+            "amount": [float(i) for i in range(1, 101)],
+        }
+    )
+
+
+@pytest.fixture
+def parquet_dir(tmp_path, sales_df):
+    sales_df.iloc[:50].to_parquet(tmp_path / "part1.parquet", index=False)
+    sales_df.iloc[50:].to_parquet(tmp_path / "part2.parquet", index=False)
+    return tmp_path
+
+
+def test_from_parquet_filter_and_mean_without_loading(parquet_dir, sales_df):
+    with List.from_parquet(str(parquet_dir / "part1.parquet")) as lst:
+        assert lst._frame is None
+        assert lst.mean("amount").result() == sales_df.iloc[:50]["amount"].mean()
+        result = lst.filter("region = 'North'").data()
+        assert result["id"].tolist() == list(range(1, 51, 4))
+
+
+def test_persist_file_source_into_database(parquet_dir, tmp_path):
+    path = str(parquet_dir / "*.parquet")
+    with List.from_parquet(path, database=str(tmp_path / "db.duckdb")) as lst:
+        lst.persist("sales").filter("amount > 90")
+        assert lst.data()["id"].tolist() == list(range(91, 101))
+        count = lst.db.execute("SELECT COUNT(*) FROM sales").fetchone()[0]
+        assert count == 100
+
+
+def test_from_glob_reads_every_matching_file(parquet_dir, sales_df):
+    with List.from_glob(str(parquet_dir / "*.parquet"), lazy=True) as lst:
+        lst.run_query(
+            select=["region", "SUM(amount) AS total"],
+            group_by=["region"],
+            order_by=["region"],
+        )
+        result = lst.data()
+        expected = sales_df.groupby("region")["amount"].sum().sort_index()
+        assert result["total"].tolist() == expected.tolist()
+
+
+def test_filters_are_pushed_into_the_parquet_scan(parquet_dir):
+    with List.from_parquet(str(parquet_dir / "*.parquet"), lazy=True) as lst:
+        lst.filter("id > 90").select(["id"])
+        plan = lst.db.execute(f"EXPLAIN {lst._plan}").fetchall()[0][1]
+        assert "READ_PARQUET" in plan.upper() or "PARQUET_SCAN" in plan.upper()
+        assert "Filters" in plan
+
+
+def test_from_csv_with_reader_options(tmp_path, sales_df):
+    path = tmp_path / "sales.csv"
+    sales_df.to_csv(path, index=False, sep=";")
+    with List.from_csv(str(path), options={"delim": ";", "header": True}) as lst:
+        assert lst.stats({"amount": ["count", "max"]}) == {
+            "amount": {"count": 100, "max": 100.0}
+        }
+
+
+def test_from_glob_rejects_unknown_extension():
+    with pytest.raises(ValueError, match="Cannot infer a reader"):
+        List.from_glob("data/*.xlsx")
@@ -0,0 +1,95 @@
+import sys
+import os
+import dataclasses
+import pickle
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest
+from m_ast import compile_plan, explain_step, freeze, nodes, optimize
+from m_ast import frozen as F
+from m_ast.compiler import _compile_frozen, _fragments, plan_key
+
+
+def _plan():
+    rows = F.SelectRows("sales", "amount > 0")
+    return F.Group(rows, ["region"], {"total": "SUM(amount)"})
+
+
+def test_structural_equality_and_hash():
+    assert _plan() == _plan()
+    assert hash(_plan()) == hash(_plan())
+    assert _plan() != F.Group(_plan().table, ["region"], {"n": "COUNT(*)"})
+    # Dict order decides column order, so it is part of the identity
+    a = F.Group("t", ["k"], {"x": "SUM(a)", "y": "SUM(b)"})
+    b = F.Group("t", ["k"], {"y": "SUM(b)", "x": "SUM(a)"})
+    assert a != b
+    assert len({_plan(), _plan(), a, b}) == 3
+
+
+def test_frozen_nodes_are_immutable_slotted_and_pass_isinstance():
+    node = _plan()
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        node.keys = ["other"]
+    with pytest.raises(TypeError):
+        node.aggs["n"] = "COUNT(*)"
+    assert not hasattr(node, "__dict__")
+    assert isinstance(node, nodes.Group)
+    assert isinstance(node.keys, tuple)
+    assert repr(node) == repr(
+        nodes.Group(nodes.SelectRows("sales", "amount > 0"), ["region"], node.aggs)
+    )
+    assert explain_step(node) == "Group: by [region] with total=SUM(amount)"
+
+
+def test_freeze_converts_and_keeps_sharing():
+    shared = nodes.SelectRows("t", "a > 1")
+    plan = nodes.Join(shared, shared, {"id": "id"})
+    frozen = freeze(plan)
+    assert isinstance(frozen, F.Join)
+    assert frozen.left is frozen.right
+    assert frozen == F.Join(F.SelectRows("t", "a > 1"), frozen.right, {"id": "id"})
+    assert compile_plan(frozen) == compile_plan(plan)
+    assert plan_key(frozen) == plan_key(plan)
+    assert freeze(frozen) is frozen
+
+
+def test_compile_is_memoized_on_the_node_hash():
+    _compile_frozen.cache_clear()
+    sql = compile_plan(_plan())
+    for _ in range(3):
+        assert compile_plan(_plan()) == sql
+    info = _compile_frozen.cache_info()
+    assert (info.misses, info.hits) == (1, 3)
+
+
+def _shared_plans(m):
+    shared = m.AddColumn(m.SelectRows("sales", "amount > 0"), "net", "amount * 0.8")
+    first = m.Group(shared, ["region"], {"total": "SUM(net)"})
+    pivoted = m.Pivot(shared, "region", "net", "sum")
+    joined = m.Join(m.Buffer(shared), pivoted, {"id": "id"})
+    return shared, first, m.Join(first, joined, {"region": "region"})
+
+
+def test_shared_subplans_are_compiled_once():
+    shared, first, other = _shared_plans(F)
+    compile_plan(first)
+    fragment = _fragments[shared]
+    # The cached subtree is spliced in with its names renumbered, giving the
+    # same SQL as compiling the mutable plan from scratch
+    assert compile_plan(other) == compile_plan(_shared_plans(nodes)[2])
+    assert _fragments[shared] is fragment
+
+
+def test_optimize_and_replace_keep_plans_frozen():
+    plan = F.SelectRows(F.Join("a", "b", {"id": "id"}), "x > 1 AND y > 2")
+    out = optimize(plan, {"a": ["id", "x"], "b": ["id", "y"]})
+    assert isinstance(out, F.FrozenNode)
+    assert isinstance(out.left, F.FrozenNode)
+    replaced = dataclasses.replace(plan, table=nodes.SelectRows("c", "z"))
+    assert isinstance(replaced.table, F.SelectRows)
+
+
+def test_pickle_round_trip():
+    node = _plan()
+    assert pickle.loads(pickle.dumps(node)) == node
@@ -0,0 +1,57 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pandas as pd
+import pytest
+from main import List
+
+pa = pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def big_df():
+    return pd.DataFrame({"id": range(10_000), "grp": [i % 7 for i in range(10_000)]})
+
+
+def test_iter_batches_yields_bounded_record_batches(big_df):
+    with List(big_df) as lst:
+        batches = list(lst.iter_batches(batch_size=2048))
+        assert all(isinstance(b, pa.RecordBatch) for b in batches)
+        assert all(b.num_rows <= 2048 for b in batches)
+        assert sum(b.num_rows for b in batches) == len(big_df)
+
+
+def test_iter_batches_as_pandas_chunks(big_df):
+    with List(big_df) as lst:
+        chunks = list(lst.filter("grp = 3").iter_batches(4096, as_pandas=True))
+        combined = pd.concat(chunks, ignore_index=True)
+        assert combined["id"].tolist() == big_df[big_df["grp"] == 3]["id"].tolist()
+
+
+def test_run_query_stream_defers_materialization(big_df):
+    with List(big_df) as lst:
+        lst.run_query(
+            select=["grp", "COUNT(*) AS n"],
+            where=["id >= ?"],
+            group_by=["grp"],
+            order_by=["grp"],
+            params=[5000],
+            stream=True,
+        )
+        assert lst._plan is not None
+        rows = [r for b in lst.iter_batches(2) for r in b.to_pylist()]
+        assert len(rows) == 7
+        assert sum(r["n"] for r in rows) == 5000
+        # The List stays usable while and after streaming
+        assert lst._plan is not None
+
+
+def test_list_can_be_queried_while_iterating(big_df):
+    with List(big_df) as lst:
+        seen = 0
+        for batch in lst.iter_batches(2048):
+            seen += batch.num_rows
+            assert lst.mean("id").result() == big_df["id"].mean()
+        assert seen == len(big_df)
@@ -0,0 +1,35 @@
+import sys
+import os
+import subprocess
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+
+_CHECK = """
+import sys
+import main
+heavy = ("pandas", "duckdb", "pyarrow", "jinja2", "asyncio")
+print(",".join(name for name in heavy if name in sys.modules))
+"""
+
+
+def _loaded(code: str) -> str:
+    env = dict(os.environ, PYTHONPATH=SRC)
+    proc = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True
+    )
+    assert proc.returncode == 0, proc.stderr
+    return proc.stdout.strip()
+
+
+def test_importing_main_defers_heavy_dependencies():
+    assert _loaded(_CHECK) == ""
+
+
+def test_dependencies_load_on_first_use():
+    code = """
+import main
+lst = main.List(main.pd.DataFrame({"a": [1, 2, 3]}))
+print(lst.run_query(where=["a > 1"]).data()["a"].tolist())
+print(type(main.pd).__name__, type(main.duckdb).__name__)
+"""
+    assert _loaded(code).splitlines()[-2:] == ["[2, 3]", "module module"]
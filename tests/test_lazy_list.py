@@ -0,0 +1,77 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pandas as pd
+from main import List
+
+
+def _frame():
+    return pd.DataFrame(
+        {
+            "id": [1, 2, 3, 4, 5],
+            "age": [25, 30, 35, 40, 45],
+            "dept": ["IT", "HR", "IT", "Finance", "IT"],
+        }
+    )
+
+
+def test_lazy_chain_defers_execution_until_data():
+    df = _frame()
+    with List(df, lazy=True) as lst:
+        lst.filter("age > 25").order(["age DESC"]).limit(2)
+        # Nothing has been materialized yet: the original frame is untouched
+        assert lst._plan is not None
+        assert lst._frame is df
+        result = lst.data()
+        assert lst._plan is None
+        assert list(result["age"]) == [45, 40]
+
+
+def test_lazy_chain_matches_eager_chain():
+    df = _frame()
+    with List(df) as eager, List(df, lazy=True) as lazy:
+        expected = eager.filter("dept = 'IT'").select(["id", "age"]).data()
+        result = lazy.filter("dept = 'IT'").select(["id", "age"]).data()
+        pd.testing.assert_frame_equal(result, expected)
+
+
+def test_lazy_chain_that_narrows_the_schema():
+    with List(_frame(), lazy=True) as lst:
+        lst.filter("age > 30").select(["id", "dept"]).select(["id"]).limit(2)
+        assert list(lst.data()["id"]) == [3, 4]
+    with List(_frame(), lazy=True) as lst:
+        lst.filter("age > 25").select(["id"]).order(["id DESC"])
+        assert lst.mean("id").result() == 3.5
+    with List(_frame(), lazy=True) as lst:
+        lst.run_query(select=["dept", "COUNT(*) AS n"], group_by=["dept"])
+        result = lst.filter("n > 1").data()
+        assert list(result["dept"]) == ["IT"]
+
+
+def test_lazy_aggregate_runs_over_pending_plan():
+    df = _frame()
+    with List(df, lazy=True) as lst:
+        value = lst.filter("dept = 'IT'").mean("age").result()
+        assert value == df[df["dept"] == "IT"]["age"].mean()
+        # Aggregates read through the plan without materializing it
+        assert lst._plan is not None
+
+
+def test_lazy_run_query_is_deferred():
+    df = _frame()
+    with List(df, lazy=True) as lst:
+        lst.run_query(select=["dept", "COUNT(*) AS n"], group_by=["dept"])
+        assert lst._plan is not None
+        result = lst.order(["n DESC"]).limit(1).data()
+        assert list(result.columns) == ["dept", "n"]
+        assert result.iloc[0]["dept"] == "IT"
+
+
+def test_lazy_order_limit_fuses_into_top_n():
+    df = _frame()
+    with List(df, lazy=True) as lst:
+        lst.order(["age"]).limit(1)
+        plan = lst.db.execute(f"EXPLAIN {lst._plan}").fetchall()[0][1]
+        assert "TOP_N" in plan
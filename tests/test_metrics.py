@@ -0,0 +1,82 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pandas as pd
+import pytest
+from main import List, MetricsAggregator, PrometheusExporter
+
+
+def _frame():
+    return pd.DataFrame({"id": range(100), "g": [i % 4 for i in range(100)]})
+
+
+class _Collect:
+    def __init__(self):
+        self.records = []
+
+    def record(self, metrics):
+        self.records.append(metrics)
+
+
+def test_records_timings_sql_and_sizes():
+    sink = _Collect()
+    with List(_frame(), metrics=sink) as lst:
+        lst.filter("id < 10").run_query(select=["g", "COUNT(*) AS n"], group_by=["g"])
+        lst.quantile("n", 0.5)
+    filt, query, quantile = sink.records
+    assert [r.method for r in sink.records] == ["filter", "run_query", "quantile"]
+    assert filt.sql == "SELECT * from current_df WHERE id < 10"
+    assert (filt.input_rows, filt.output_rows) == (100, 10)
+    assert filt.output_bytes > 0 and filt.execute_time > 0
+    assert query.render_time > 0 and query.output_rows == 4
+    assert "GROUP BY" in query.sql
+    assert quantile.output_rows is None and quantile.execute_time > 0
+    assert quantile.total_time >= quantile.execute_time
+    assert all(r.error is None for r in sink.records)
+
+
+def test_aggregator_sums_per_method_and_counts_errors():
+    agg = MetricsAggregator()
+    with List(_frame(), metrics=[agg]) as lst:
+        lst.mean("id")
+        lst.mean("g")
+        with pytest.raises(KeyError):
+            lst.quantile("missing", 0.5)
+    summary = agg.summary()
+    assert summary["mean"]["calls"] == 2
+    assert summary["mean"]["input_rows"] == 200
+    assert summary["quantile"]["errors"] == 1
+    assert list(agg.to_frame().index)[0] in {"mean", "quantile"}
+    agg.reset()
+    assert agg.summary() == {}
+
+
+def test_lazy_input_is_unknown_and_nested_calls_are_not_recorded():
+    sink = _Collect()
+    with List(_frame(), lazy=True, metrics=sink) as lst:
+        lst.filter("id < 50").collect()
+    assert [r.method for r in sink.records] == ["filter", "collect"]
+    assert sink.records[0].execute_time == 0
+    assert sink.records[1].input_rows is None
+    assert sink.records[1].output_rows == 50
+
+
+def test_prometheus_exporter_writes_text_file(tmp_path):
+    path = tmp_path / "duckquery.prom"
+    exporter = PrometheusExporter(str(path), interval=0)
+    with List(_frame(), metrics=exporter) as lst:
+        lst.filter("g = 1")
+    text = path.read_text()
+    assert "# TYPE duckquery_seconds_total counter" in text
+    assert 'duckquery_calls_total{method="filter"} 1' in text
+    assert 'duckquery_rows_total{method="filter",direction="output"} 25' in text
+
+
+def test_run_many_workers_report_to_shared_sink():
+    agg = MetricsAggregator()
+    with List(_frame(), metrics=agg) as lst:
+        lst.run_many([{"where": [f"g = {g}"]} for g in range(4)], max_workers=2)
+    assert agg.summary()["run_query"]["calls"] == 4
+    assert agg.summary()["run_query"]["output_rows"] == 100
@@ -0,0 +1,207 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import duckdb
+import pandas as pd
+import pytest
+from m_ast import compile_plan, optimize
+from m_ast.nodes import (
+    AddColumn,
+    Buffer,
+    Group,
+    Join,
+    Pivot,
+    RenameColumns,
+    SelectColumns,
+    SelectRows,
+)
+from main import List
+
+SCHEMA = {
+    "employees": ["id", "age", "dept_id"],
+    "departments": ["dept_id", "dept_name", "budget"],
+}
+
+
+@pytest.fixture
+def con():
+    con = duckdb.connect()
+    con.register(
+        "employees",
+        pd.DataFrame(
+            {
+                "id": [1, 2, 3, 4, 5],
+                "age": [25, 35, 45, 55, 65],
+                "dept_id": [1, 2, 1, 3, 2],
+            }
+        ),
+    )
+    con.register(
+        "departments",
+        pd.DataFrame(
+            {
+                "dept_id": [1, 2, 3],
+                "dept_name": ["Eng", "Sales", "HR"],
+                "budget": [10, 20, 30],
+            }
+        ),
+    )
+    yield con
+    con.close()
+
+
+def _same_rows(con, plan, params=None):
+    expected = con.execute(compile_plan(plan), params).fetchall()
+    actual = con.execute(compile_plan(optimize(plan, SCHEMA)), params).fetchall()
+    assert sorted(actual) == sorted(expected)
+
+
+def test_adjacent_filters_merge():
+    plan = SelectRows(SelectRows("employees", "age > 30"), "dept_id = 1 OR id = 2")
+    assert optimize(plan) == SelectRows(
+        "employees", "(age > 30) AND (dept_id = 1 OR id = 2)"
+    )
+
+
+def test_between_is_not_split():
+    plan = SelectRows(SelectRows("employees", "age BETWEEN 30 AND 50"), "id > 1")
+    assert optimize(plan).condition == "(age BETWEEN 30 AND 50) AND (id > 1)"
+
+
+def test_filter_moves_below_addcolumn_unless_it_uses_it(con):
+    plan = SelectRows(
+        AddColumn("employees", "decade", "age // 10"), "decade = 4 AND id > 1"
+    )
+    result = optimize(plan)
+    assert result == SelectRows(
+        AddColumn(SelectRows("employees", "id > 1"), "decade", "age // 10"),
+        "decade = 4",
+    )
+    _same_rows(con, plan)
+
+
+def test_filter_moves_below_rename_with_old_names(con):
+    plan = SelectRows(RenameColumns("employees", {"age": "years"}), "years >= 45")
+    result = optimize(plan)
+    assert result == RenameColumns(
+        SelectRows("employees", '"age" >= 45'), {"age": "years"}
+    )
+    _same_rows(con, plan)
+
+
+def test_filter_after_join_moves_into_inputs(con):
+    joined = Join("employees", "departments", {"dept_id": "dept_id"})
+    plan = SelectRows(joined, "age > 30 AND budget >= 20 AND dept_id <> 3")
+    result = optimize(plan, SCHEMA)
+    assert result == Join(
+        SelectRows("employees", "(age > 30) AND (dept_id <> 3)"),
+        SelectRows("departments", "(budget >= 20) AND (dept_id <> 3)"),
+        {"dept_id": "dept_id"},
+    )
+    _same_rows(con, plan)
+
+
+def test_left_join_keeps_right_side_filters_on_top(con):
+    joined = Join("employees", "departments", {"dept_id": "dept_id"}, "left")
+    plan = SelectRows(joined, "budget > 10 AND age < 60")
+    result = optimize(plan, SCHEMA)
+    assert result == SelectRows(
+        Join(
+            SelectRows("employees", "age < 60"),
+            "departments",
+            {"dept_id": "dept_id"},
+            "left",
+        ),
+        "budget > 10",
+    )
+    _same_rows(con, plan)
+
+
+def test_join_pushdown_needs_schema():
+    joined = Join("employees", "departments", {"dept_id": "dept_id"})
+    plan = SelectRows(joined, "age > 30")
+    assert optimize(plan) == plan
+
+
+def test_projection_prunes_addcolumn_groups_and_join_inputs(con):
+    joined = Join(
+        AddColumn("employees", "unused", "age * 2"),
+        "departments",
+        {"dept_id": "dept_id"},
+    )
+    plan = SelectColumns(
+        Group(joined, ["dept_name"], {"n": "COUNT(*)", "oldest": "MAX(age)"}),
+        ["dept_name", "n"],
+    )
+    result = optimize(plan, SCHEMA)
+    assert result == SelectColumns(
+        Group(
+            Join(
+                SelectColumns("employees", ["dept_id"]),
+                SelectColumns("departments", ["dept_id", "dept_name"]),
+                {"dept_id": "dept_id"},
+            ),
+            ["dept_name"],
+            {"n": "COUNT(*)"},
+        ),
+        ["dept_name", "n"],
+    )
+    _same_rows(con, plan)
+
+
+def test_pivot_join_input_keeps_its_group_by_columns(con):
+    pivoted = Pivot(
+        SelectColumns("employees", ["id", "age", "dept_id"]), "id", "age", "sum", [1, 2]
+    )
+    joined = Join(pivoted, "departments", {"dept_id": "dept_id"})
+    for columns in (["dept_name"], ["dept_name", "1"], ["budget"]):
+        _same_rows(con, SelectColumns(joined, columns))
+    result = optimize(SelectColumns(joined, ["dept_name"]), SCHEMA)
+    assert result.table.left == SelectColumns(pivoted, ["dept_id"])
+
+
+def test_buffer_stops_pushdown_and_pruning(con):
+    buffered = Buffer(SelectRows(SelectRows("employees", "age > 20"), "id < 5"))
+    plan = SelectColumns(SelectRows(buffered, "dept_id = 1"), ["id"])
+    result = optimize(plan, SCHEMA)
+    assert result == SelectColumns(
+        SelectRows(
+            Buffer(SelectRows("employees", "(age > 20) AND (id < 5)")), "dept_id = 1"
+        ),
+        ["id"],
+    )
+    _same_rows(con, plan)
+
+
+def test_positional_parameters_keep_their_order(con):
+    plan = SelectRows(
+        SelectRows(AddColumn("employees", "older", "age + ?"), "older > ?"),
+        "id > 1",
+    )
+    result = optimize(plan, SCHEMA)
+    assert result == SelectRows(
+        AddColumn(SelectRows("employees", "id > 1"), "older", "age + ?"),
+        "older > ?",
+    )
+    _same_rows(con, plan, [10, 50])
+
+
+def test_run_query_optimizes_against_registered_tables():
+    employees = pd.DataFrame(
+        {"id": [1, 2, 3], "age": [30, 40, 50], "dept_id": [1, 2, 1]}
+    )
+    depts = pd.DataFrame({"dept_id": [1, 2], "dept_name": ["Eng", "Sales"]})
+    with List(employees) as lst:
+        lst.register_table("departments", depts)
+        plan = SelectColumns(
+            SelectRows(
+                Join("current_df", "departments", {"dept_id": "dept_id"}),
+                "dept_name = 'Eng'",
+            ),
+            ["id"],
+        )
+        assert "departments" in lst._plan_schema()
+        result = lst.run_query(select=plan).data()
+        assert sorted(result["id"]) == [1, 3]
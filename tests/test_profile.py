@@ -0,0 +1,75 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pandas as pd
+from main import List
+from m_ast import explain_step
+from m_ast.nodes import Group, Join, SelectRows
+
+
+def _frame():
+    return pd.DataFrame(
+        {"id": range(1000), "g": [i % 5 for i in range(1000)], "v": range(1000)}
+    )
+
+
+def test_profile_attributes_operators_to_clauses():
+    with List(_frame()) as lst:
+        report = lst.profile(
+            {
+                "select": ["g", "SUM(v) AS s"],
+                "where": ["v > ?"],
+                "group_by": ["g"],
+                "having": "SUM(v) > 0",
+                "order_by": ["g"],
+                "limit": 3,
+                "params": [10],
+            }
+        )
+        steps = {step["step"]: step for step in report["steps"]}
+        assert {"from", "where", "group_by", "having", "order_by"} <= set(steps)
+        assert steps["from"]["rows"] == 1000
+        assert steps["where"]["rows"] == 989
+        assert steps["group_by"]["rows"] == 5
+        assert report["rows"] == 3
+        assert report["latency"] >= 0
+        assert all(op["step"] in steps for op in report["operators"])
+        # Profiling leaves current_df alone
+        assert len(lst.data()) == 1000
+
+
+def test_profile_sql_string():
+    with List(_frame()) as lst:
+        report = lst.profile("SELECT * FROM current_df WHERE v < 5")
+        assert [step["step"] for step in report["steps"]] == ["where", "from"]
+        assert report["rows"] == 5
+        # The profiler is switched off again afterwards
+        lst.filter("v < 10")
+        assert len(lst.data()) == 10
+
+
+def test_explain_analyze_maps_operators_to_steps():
+    with List(_frame()) as lst:
+        lst.register_table(
+            "depts", pd.DataFrame({"g": range(5), "name": list("abcde")})
+        )
+        filtered = SelectRows("current_df", "v > 500")
+        plan = Group(Join(filtered, "depts", {"g": "g"}), ["name"], {"n": "COUNT(*)"})
+        report = lst.explain(plan)
+        steps = {step["step"]: step for step in report["steps"]}
+        assert steps[explain_step(filtered)]["rows"] == 499
+        assert "FILTER" in steps[explain_step(filtered)]["operators"]
+        assert "HASH_JOIN" in steps[explain_step(plan.table)]["operators"]
+        assert steps[explain_step(plan)]["rows"] == 5
+        assert report["rows"] == 5
+
+
+def test_explain_without_analyze():
+    with List(_frame()) as lst:
+        plan = SelectRows("current_df", "v > 500")
+        report = lst.explain(plan, analyze=False)
+        assert "FILTER" in report["plan"] or "SCAN" in report["plan"]
+        assert report["steps"][-1]["step"] == explain_step(plan)
+        assert report["sql"].startswith("SELECT")
@@ -0,0 +1,56 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np
+import pandas as pd
+import pytest
+from main import List, Outlier
+
+
+@pytest.fixture
+def noisy_df():
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame({"x": rng.normal(50, 10, 500)})
+    df.loc[df.sample(frac=0.1, random_state=1).index, "x"] = None
+    return df
+
+
+@pytest.mark.parametrize("percentile", [0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0])
+def test_quantile_matches_pandas_with_nulls(noisy_df, percentile):
+    with List(noisy_df) as lst:
+        result = lst.quantile("x", percentile).result()
+        assert result == pytest.approx(noisy_df["x"].quantile(percentile))
+
+
+def test_quantile_missing_column_raises(noisy_df):
+    with List(noisy_df) as lst:
+        with pytest.raises(KeyError):
+            lst.quantile("missing", 0.5)
+
+
+@pytest.mark.parametrize("tail", [Outlier.HIGH, Outlier.LOW])
+def test_outlier_iqr_bounds_match_pandas(noisy_df, tail):
+    q1 = noisy_df["x"].quantile(0.25)
+    q3 = noisy_df["x"].quantile(0.75)
+    iqr = q3 - q1
+    expected = q3 + 1.5 * iqr if tail == Outlier.HIGH else q1 - 1.5 * iqr
+    with List(noisy_df) as lst:
+        assert lst.outlier("x", tail).result() == pytest.approx(expected)
+
+
+def test_outlier_extreme_max_uses_stddev_bound():
+    df = pd.DataFrame({"age": [20, 25, 30, 35, 40, 1000]})
+    expected = df["age"].mean() + 3 * df["age"].std()
+    with List(df) as lst:
+        assert lst.outlier("age", Outlier.HIGH).result() == pytest.approx(expected)
+
+
+def test_outlier_runs_over_lazy_plan_without_materializing(noisy_df):
+    filtered = noisy_df[noisy_df["x"] > 40]["x"]
+    q1, q3 = filtered.quantile(0.25), filtered.quantile(0.75)
+    with List(noisy_df, lazy=True) as lst:
+        result = lst.filter("x > 40").outlier("x", Outlier.LOW).result()
+        assert lst._plan is not None
+        assert result == pytest.approx(q1 - 1.5 * (q3 - q1))
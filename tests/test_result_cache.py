@@ -0,0 +1,93 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pandas as pd
+import pytest
+from main import List, ResultCache, _canonical_sql
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame(
+        {
+            "id": [1, 2, 3, 4, 5],
+            "age": [25, 30, 35, 40, 45],
+            "department": ["IT", "HR", "IT", "Finance", "IT"],
+        }
+    )
+
+
+def test_repeated_query_on_unchanged_data_hits_cache(sample_df):
+    cache = ResultCache()
+    with List(sample_df, cache=cache) as first:
+        expected = first.run_query(where=["age > 28", "department = 'IT'"]).data()
+    with List(sample_df, cache=cache) as second:
+        # Same terms in a different order share one canonical key
+        result = second.run_query(where=["department = 'IT'", "age > 28"]).data()
+    assert cache.hits == 1 and cache.misses == 1
+    assert result is expected
+
+
+def test_canonical_sql_keeps_quoted_whitespace():
+    assert _canonical_sql("SELECT  *\n FROM t") == "SELECT * FROM t"
+    assert _canonical_sql("WHERE name = 'a  b'") == "WHERE name = 'a  b'"
+
+
+def test_different_data_does_not_hit(sample_df):
+    cache = ResultCache()
+    with List(sample_df, cache=cache) as lst:
+        lst.run_query(where=["age > 28"])
+    with List(sample_df.copy(), cache=cache) as lst:
+        lst.run_query(where=["age > 28"])
+    assert cache.hits == 0
+
+
+def test_register_invalidates_entries_built_from_the_frame(sample_df):
+    cache = ResultCache()
+    with List(sample_df, cache=cache) as lst:
+        lst.run_query(where=["age > 50"])
+    assert len(cache) == 1
+    with List(sample_df, cache=cache) as lst:
+        sample_df.loc[0, "age"] = 99
+        lst.register()
+        assert len(cache) == 0
+        assert lst.run_query(where=["age > 50"]).data()["id"].tolist() == [1]
+
+
+def test_register_drops_a_cached_result_edited_in_place(sample_df):
+    cache = ResultCache()
+    with List(sample_df, cache=cache) as lst:
+        result = lst.run_query(where=["age > 28"]).data()
+        result.loc[result.index[0], "age"] = -1
+        lst.register()
+    assert len(cache) == 0
+    with List(sample_df, cache=cache) as lst:
+        assert lst.run_query(where=["age > 28"]).data()["age"].min() == 30
+
+
+def test_register_table_invalidates_dependent_entries(sample_df):
+    cache = ResultCache()
+    depts = pd.DataFrame({"department": ["IT"], "floor": [3]})
+    with List(sample_df, cache=cache) as lst:
+        lst.register_table("depts", depts)
+        lst.run_query(
+            select=["id", "floor"],
+            joins=[{"type": "INNER", "table": "depts", "using": ["department"]}],
+        )
+        assert len(cache) == 1
+        lst.register_table("depts", pd.DataFrame({"department": ["HR"], "floor": [1]}))
+        assert len(cache) == 0
+
+
+def test_lru_eviction_by_entries_and_bytes(sample_df):
+    cache = ResultCache(max_entries=2)
+    for age in (20, 30, 40):
+        with List(sample_df, cache=cache) as lst:
+            lst.run_query(where=[f"age > {age}"])
+    assert len(cache) == 2
+    tiny = ResultCache(max_bytes=1)
+    with List(sample_df, cache=tiny) as lst:
+        lst.run_query(where=["age > 20"])
+    assert len(tiny) == 0 and tiny.nbytes == 0
@@ -0,0 +1,87 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pandas as pd
+from main import List, ResultCache
+
+
+def _frame():
+    return pd.DataFrame(
+        {
+            "id": [1, 2, 3, 4, 5, 6],
+            "age": [25, 30, 35, 40, 45, 50],
+            "dept": ["IT", "HR", "IT", "Finance", "IT", "HR"],
+        }
+    )
+
+
+def _specs():
+    return [
+        {
+            "select": ["dept", "COUNT(*) AS n"],
+            "group_by": ["dept"],
+            "order_by": ["dept"],
+        },
+        {"select": ["id"], "where": ["age > ?"], "params": [40], "order_by": ["id"]},
+        {"select": ["MAX(age) AS oldest"]},
+    ]
+
+
+def test_run_many_returns_results_in_spec_order():
+    with List(_frame()) as lst:
+        counts, ids, oldest = lst.run_many(_specs(), max_workers=3)
+        assert list(counts["dept"]) == ["Finance", "HR", "IT"]
+        assert list(counts["n"]) == [1, 2, 3]
+        assert list(ids["id"]) == [5, 6]
+        assert oldest.iloc[0]["oldest"] == 50
+
+
+def test_run_many_matches_sequential_run_query():
+    df = _frame()
+    with List(df) as lst:
+        results = lst.run_many(_specs() * 4, max_workers=2)
+    for spec, result in zip(_specs() * 4, results):
+        with List(df) as single:
+            expected = single.run_query(**spec).data()
+        pd.testing.assert_frame_equal(
+            result.reset_index(drop=True), expected.reset_index(drop=True)
+        )
+
+
+def test_run_many_leaves_current_df_unchanged():
+    df = _frame()
+    with List(df) as lst:
+        lst.run_many(_specs())
+        assert lst._frame is df
+        assert lst.mean("age").result() == df["age"].mean()
+
+
+def test_run_many_sees_registered_tables_and_pending_plan():
+    depts = pd.DataFrame({"dept": ["IT", "HR"], "floor": [3, 1]})
+    with List(_frame(), lazy=True) as lst:
+        lst.register_table("depts", depts)
+        lst.filter("age >= 30")
+        spec = {
+            "select": ["floor", "COUNT(*) AS n"],
+            "joins": [{"type": "INNER", "table": "depts", "using": ["dept"]}],
+            "group_by": ["floor"],
+            "order_by": ["floor"],
+        }
+        (result,) = lst.run_many([spec])
+        assert list(result["floor"]) == [1, 3]
+        assert list(result["n"]) == [2, 2]
+
+
+def test_run_many_uses_result_cache():
+    cache = ResultCache()
+    with List(_frame(), cache=cache) as lst:
+        lst.run_many(_specs())
+        lst.run_many(_specs())
+        assert cache.hits == len(_specs())
+
+
+def test_run_many_empty():
+    with List(_frame()) as lst:
+        assert lst.run_many([]) == []
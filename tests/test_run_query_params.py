@@ -0,0 +1,86 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pandas as pd
+import pytest
+from main import List, Jointype, _render_sql
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame(
+        {
+            "id": [1, 2, 3, 4, 5],
+            "name": ["Alice", "Bob", "Charlie", "David", "Eve"],
+            "age": [25, 30, 35, 40, 45],
+            "department": ["IT", "HR", "IT", "Finance", "IT"],
+        }
+    )
+
+
+def test_where_values_are_bound_as_parameters(sample_df):
+    with List(sample_df) as lst:
+        result = lst.run_query(
+            select=["name"], where=["age > ?", "department = ?"], params=[28, "IT"]
+        ).data()
+        assert result["name"].tolist() == ["Charlie", "Eve"]
+
+
+def test_named_parameters_in_having(sample_df):
+    with List(sample_df) as lst:
+        result = lst.run_query(
+            select=["department", "COUNT(*) AS n"],
+            group_by=["department"],
+            having="COUNT(*) >= $min_n",
+            params={"min_n": 2},
+        ).data()
+        assert result["department"].tolist() == ["IT"]
+
+
+def test_repeated_shapes_reuse_rendered_sql(sample_df):
+    _render_sql.cache_clear()
+    for min_age in (20, 30, 40):
+        with List(sample_df) as lst:
+            lst.run_query(select=["name"], where=["age > ?"], params=[min_age])
+    info = _render_sql.cache_info()
+    assert info.misses == 1
+    assert info.hits == 2
+
+
+def test_joins_share_the_render_cache(sample_df):
+    depts = pd.DataFrame({"department": ["IT", "HR"], "floor": [3, 1]})
+    join = {"type": Jointype.INNER, "table": "depts", "using": ["department"]}
+    _render_sql.cache_clear()
+    for floor in (1, 3):
+        with List(sample_df) as lst:
+            lst.register_table("depts", depts)
+            lst.run_query(
+                select=["name", "floor"],
+                where=["floor = ?"],
+                joins=[join],
+                params=[floor],
+            )
+    assert _render_sql.cache_info().hits == 1
+
+
+def test_lazy_plan_carries_bound_parameters(sample_df):
+    with List(sample_df, lazy=True) as lst:
+        lst.run_query(where=["age >= ?"], params=[30])
+        lst.run_query(select=["name"], where=["department = ?"], params=["IT"])
+        assert lst._plan_params == [30, "IT"]
+        assert lst.data()["name"].tolist() == ["Charlie", "Eve"]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_lazy_plan_carries_named_parameters(sample_df, stream):
+    with List(sample_df, lazy=True) as lst:
+        lst.run_query(where=["age > $x"], params={"x": 30}, stream=stream)
+        lst.run_query(select=["name"], where=["department = $d"], params={"d": "IT"})
+        assert lst._plan_params == {"x": 30, "d": "IT"}
+        with pytest.raises(ValueError, match="mix positional and named"):
+            lst.run_query(where=["name <> ?"], params=["Eve"])
+        with pytest.raises(ValueError, match="rebound"):
+            lst.run_query(where=["age < $x"], params={"x": 50})
+        assert lst.data()["name"].tolist() == ["Charlie", "Eve"]
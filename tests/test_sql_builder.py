@@ -0,0 +1,55 @@
+import sys
+import os
+import itertools
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest
+from jinja2 import Environment, PackageLoader, select_autoescape
+from main import _build_sql
+
+_JOINS = [
+    [],
+    [{"type": "inner", "table": "depts", "using": ["dept_id"]}],
+    [
+        {"type": "LEFT", "table": "a", "condition": "current_df.id = a.id"},
+        {"type": "cross", "table": "b"},
+        {"table": "c", "using": ("x", "y")},
+    ],
+    [{"type": None, "table": None, "using": [], "condition": ""}],
+]
+
+_CASES = list(
+    itertools.product(
+        [[], ["id"], ["a", "COUNT(*) AS n", 'current_df."b"']],
+        [[], ["age > ?"], ["a = 1", "b IN (1, 2)", "c <> 'x'"]],
+        [[], ["a", "b"]],
+        [None, "", 0, "COUNT(*) > 1"],
+        [[], ["a DESC", "b"]],
+        [None, 0, 10],
+        [None, 0, 5],
+        range(len(_JOINS)),
+    )
+)
+
+
+@pytest.fixture(scope="module")
+def template():
+    env = Environment(loader=PackageLoader("main"), autoescape=select_autoescape())
+    return env.get_template("sql.txt")
+
+
+def test_builder_matches_template_byte_for_byte(template):
+    for select, where, group_by, having, order_by, limit, offset, j in _CASES:
+        args = dict(
+            select=select,
+            table="current_df",
+            where=where,
+            group_by=group_by,
+            having=having,
+            order_by=order_by,
+            limit=limit,
+            offset=offset,
+            joins=_JOINS[j],
+        )
+        assert _build_sql(**args) == template.render(**args), args
@@ -0,0 +1,98 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pandas as pd
+from m_ast.emit import pivot_native
+from m_ast.nodes import Pivot, SelectRows
+from main import List
+
+
+def test_pivot_native_with_values():
+    result = pivot_native(
+        table_name="sales",
+        pivot_column="region",
+        value_column="amount",
+        agg="sum",
+        values=["East", "O'Neil", 3],
+    )
+    assert result == (
+        "PIVOT \"sales\" ON \"region\" IN ('East', 'O''Neil', 3) " 'USING SUM("amount")'
+    )
+
+
+def test_pivot_native_without_values_lets_duckdb_discover():
+    result = pivot_native("data", "category", "id", "COUNT")
+    assert result == 'PIVOT "data" ON "category" USING COUNT("id")'
+
+
+def _sales():
+    return pd.DataFrame(
+        {
+            "product": ["p1", "p1", "p2", "p2", "p3"],
+            "month": ["jan", "feb", "jan", "jan", None],
+            "amount": [1, 2, 3, 4, 5],
+        }
+    )
+
+
+def test_list_pivot_discovers_values_once(monkeypatch):
+    with List(pd.DataFrame({"x": [1]})) as lst:
+        lst.register_table("sales", _sales())
+        queries = []
+        execute = lst._execute
+
+        def spy(query, params=None):
+            queries.append(query)
+            return execute(query, params)
+
+        monkeypatch.setattr(lst, "_execute", spy)
+        plan = Pivot(SelectRows("sales", "amount < 5"), "month", "amount", "sum")
+        first = lst.run_query(select=plan).data()
+        assert list(first.columns) == ["product", "feb", "jan"]
+        rows = first.fillna(0).sort_values("product").values.tolist()
+        assert rows == [["p1", 2, 1], ["p2", 0, 7]]
+
+        lst.run_query(select=plan)
+        discovery = [q for q in queries if "SELECT DISTINCT" in q]
+        assert len(discovery) == 1
+        assert lst._pivot_cache
+
+
+def test_list_pivot_uses_agg_and_explicit_values():
+    with List(_sales()) as lst:
+        plan = Pivot("current_df", "month", "amount", "max", ["jan"])
+        result = lst.run_query(select=plan).data()
+        assert list(result.columns) == ["product", "jan"]
+        assert lst._pivot_cache == {}
+
+
+def test_list_pivot_over_filtered_current_df():
+    with List(_sales()) as lst:
+        lst.filter("amount > 1")
+        plan = Pivot(
+            SelectRows("current_df", "product <> 'p3'"), "month", "amount", "count"
+        )
+        lst.run_query(select=plan)
+        result = lst.data().sort_values("product")
+        assert result.values.tolist() == [["p1", 1, 0], ["p2", 0, 2]]
+
+
+def test_list_pivot_rediscovers_values_after_changes():
+    new_month = pd.DataFrame({"product": ["p1"], "month": ["zzz"], "amount": [9]})
+    plan = Pivot("current_df", "month", "amount", "sum")
+    with List(_sales()) as lst:
+        lst.append(new_month.iloc[:0])
+        assert "zzz" not in lst.explain(plan, analyze=False)["sql"]
+        lst.append(new_month)
+        result = lst.run_query(select=plan).data().fillna(0)
+        assert result.sort_values("product")["zzz"].tolist() == [9, 0, 0]
+    sales = _sales()
+    with List(pd.DataFrame({"x": [1]})) as lst:
+        lst.register_table("sales", sales)
+        lst.run_query(select=Pivot("sales", "month", "amount", "sum"))
+        sales.loc[0, "month"] = "zzz"
+        lst.register_table("sales", sales)
+        result = lst.run_query(select=Pivot("sales", "month", "amount", "sum"))
+        assert "zzz" in result.data().columns
@@ -0,0 +1,78 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import duckdb
+import pandas as pd
+import pytest
+from m_ast import compile_plan
+from m_ast.emit import unpivot_basic, unpivot_native
+from m_ast.nodes import SelectRows, Unpivot
+
+
+def _row_key(row):
+    return (row[0], str(row[1]))
+
+
+def test_unpivot_native_two_columns():
+    result = unpivot_native(
+        table_name="sales",
+        columns=["Q1", "Q2"],
+        attribute_column="quarter",
+        value_column="amount",
+    )
+    assert result == (
+        'SELECT "quarter", "amount" FROM (SELECT "Q1", "Q2" FROM "sales" '
+        "UNION ALL SELECT _common, _common FROM "
+        '(SELECT "Q1" AS _common FROM "sales" WHERE false '
+        'UNION ALL SELECT "Q2" FROM "sales" WHERE false)) '
+        'UNPIVOT INCLUDE NULLS ("amount" FOR "quarter" IN ("Q1", "Q2"))'
+    )
+
+
+def test_unpivot_native_single_column_reads_the_table_directly():
+    assert unpivot_native("sales", ["Q1"], "quarter", "amount") == (
+        'SELECT "quarter", "amount" FROM "sales" '
+        'UNPIVOT INCLUDE NULLS ("amount" FOR "quarter" IN ("Q1"))'
+    )
+
+
+def test_unpivot_native_matches_union_all_rows():
+    con = duckdb.connect()
+    con.register(
+        "wide",
+        pd.DataFrame({"id": [1, 2], "a": [1.5, None], "b": [3.0, 4.0], "c": [5, 6]}),
+    )
+    cols = ["a", "b", "c"]
+    native = con.execute(unpivot_native("wide", cols, "attr", "val")).fetchall()
+    basic = con.execute(unpivot_basic("wide", cols, "attr", "val")).fetchall()
+    assert sorted(native, key=_row_key) == sorted(basic, key=_row_key)
+    assert len(native) == 6
+    # The empty branches that type the columns are planned away: one scan
+    plan = con.execute(f"EXPLAIN {unpivot_native('wide', cols, 'attr', 'val')}")
+    assert plan.fetchall()[0][1].count("Function: PANDAS_SCAN") == 1
+    con.close()
+
+
+def test_unpivot_native_mixed_types_match_union_all():
+    con = duckdb.connect()
+    con.register(
+        "mixed",
+        pd.DataFrame({"id": [1, 2], "score": [1.5, None], "label": ["x", "y"]}),
+    )
+    cols = ["score", "label", "id"]
+    result = con.execute(unpivot_native("mixed", cols, "attr", "val"))
+    assert [d[1] for d in result.description] == ["VARCHAR", "VARCHAR"]
+    native = result.fetchall()
+    basic = con.execute(unpivot_basic("mixed", cols, "attr", "val")).fetchall()
+    assert sorted(native, key=_row_key) == sorted(basic, key=_row_key)
+    plan = Unpivot(SelectRows("mixed", "id = 1"), cols, "attr", "val")
+    rows = con.execute(compile_plan(plan)).fetchall()
+    assert sorted(rows, key=_row_key) == [("id", "1"), ("label", "x"), ("score", "1.5")]
+    con.close()
+
+
+def test_unpivot_native_no_columns():
+    with pytest.raises(ValueError, match="requires a non-empty 'columns' list"):
+        unpivot_native("table", [], "attribute", "value")
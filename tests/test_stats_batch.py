@@ -0,0 +1,66 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pandas as pd
+import pytest
+from main import List
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame(
+        {
+            "age": [25, 30, 35, 40, 45],
+            "salary": [50000, 60000, None, 80000, 90000],
+            "department": ["IT", "HR", "IT", "Finance", "IT"],
+        }
+    )
+
+
+def test_stats_matches_single_statistic_methods(sample_df):
+    with List(sample_df) as lst:
+        result = lst.stats({"age": ["mean", "stdev_s", 0.25], "salary": ["max"]})
+        assert result["age"]["mean"] == lst.mean("age").result()
+        assert result["age"]["stdev_s"] == pytest.approx(lst.stdev_s("age").result())
+        assert result["age"][0.25] == pytest.approx(lst.quantile("age", 0.25).result())
+        assert result["salary"]["max"] == 90000
+
+
+def test_stats_accepts_pairs_and_counts_nulls(sample_df):
+    with List(sample_df) as lst:
+        result = lst.stats([("salary", "count"), ("salary", "nulls")])
+        assert result == {"salary": {"count": 4, "nulls": 1}}
+
+
+def test_stats_issues_a_single_query(sample_df):
+    with List(sample_df) as lst:
+        executed = []
+        db = lst.db
+
+        class Recorder:
+            def execute(self, query, *args):
+                executed.append(query)
+                return db.execute(query, *args)
+
+        lst.db = Recorder()
+        lst.stats({"age": ["min", "max", "median"], "salary": ["sum", 0.9]})
+        lst.db = db
+        assert len(executed) == 1
+
+
+def test_stats_rejects_unknown_statistic_and_column(sample_df):
+    with List(sample_df) as lst:
+        with pytest.raises(ValueError, match="Unsupported statistic"):
+            lst.stats({"age": ["mode"]})
+        with pytest.raises(KeyError):
+            lst.stats({"missing": ["mean"]})
+
+
+def test_summarize_returns_one_row_per_column(sample_df):
+    with List(sample_df, lazy=True) as lst:
+        summary = lst.filter("age > 25").summarize()
+        assert list(summary["column_name"]) == ["age", "salary", "department"]
+        age = summary[summary["column_name"] == "age"].iloc[0]
+        assert age["count"] == 4